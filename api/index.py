@@ -6,49 +6,72 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
 sys.path.insert(0, parent_dir)
 
-try:
-    # Import the FastAPI app from main.py
-    from main import app
-    
-    # Add a health check endpoint for debugging
-    @app.get("/api/health")
-    async def health_check():
-        return {
-            "status": "healthy",
-            "message": "API is running",
-            "environment": os.getenv("ENVIRONMENT", "production")
-        }
-        
-except ImportError as e:
+_app = None
+
+
+def _load_app():
+    try:
+        # Import the FastAPI app from main.py
+        from main import app as main_app
+
+        # Add a health check endpoint for debugging
+        @main_app.get("/api/health")
+        async def health_check():
+            return {
+                "status": "healthy",
+                "message": "API is running",
+                "environment": os.getenv("ENVIRONMENT", "production")
+            }
+
+        return main_app
+
+    except ImportError as e:
+        # `e` is cleared when the except block ends, so keep the message
+        error = str(e)
+
     # If there's an import error, create a minimal FastAPI app
     from fastapi import FastAPI
     from fastapi.middleware.cors import CORSMiddleware
-    
-    app = FastAPI()
-    
+
+    fallback_app = FastAPI()
+
     # Add CORS for debugging
-    app.add_middleware(
+    fallback_app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
     )
-    
-    @app.get("/")
+
+    @fallback_app.get("/")
     async def root():
         return {
-            "error": f"Import error: {str(e)}", 
+            "error": f"Import error: {error}",
             "message": "Please check your dependencies",
             "environment": os.getenv("ENVIRONMENT", "production")
         }
-    
-    @app.get("/api/health")
+
+    @fallback_app.get("/api/health")
     async def health_check():
         return {
             "status": "error",
-            "error": f"Import error: {str(e)}",
+            "error": f"Import error: {error}",
             "environment": os.getenv("ENVIRONMENT", "production")
         }
 
-# Export the app for the hosting platform
\ No newline at end of file
+    return fallback_app
+
+
+def _get_app():
+    global _app
+    if _app is None:
+        _app = _load_app()
+    return _app
+
+
+# Export the app for the hosting platform. The real application (routers,
+# SQLAlchemy, schema reflection) is only imported when the first request
+# arrives, so the function itself boots without that cost.
+async def app(scope, receive, send):
+    await _get_app()(scope, receive, send)
@@ -1,9 +1,22 @@
-from sqlalchemy import create_engine, MetaData, Table, Engine
+from sqlalchemy import create_engine, MetaData, Table, Engine, text
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Iterator, Optional
 import os
+import threading
 
+__all__ = [
+    "engine",
+    "SessionLocal",
+    "get_engine",
+    "warm_pool",
+    "get_db",
+    "Database",
+    "get_tables",
+]
 
+
+@lru_cache(maxsize=1)
 def get_db_config() -> Dict[str, str]:
     return {
         "username": os.getenv("DB_USERNAME"),
@@ -13,16 +26,38 @@ def get_db_config() -> Dict[str, str]:
         "database": os.getenv("DB_NAME"),
     }
 
+@lru_cache(maxsize=1)
+def get_mysql_driver() -> str:
+    """
+    Prefer mysqlclient (C extension over libmysqlclient) and fall back to the
+    pure-Python PyMySQL driver when it is not installed. DB_DRIVER overrides.
+    """
+    driver = os.getenv("DB_DRIVER")
+    if driver:
+        return driver
+    try:
+        import MySQLdb  # noqa: F401
+        return "mysqldb"
+    except ImportError:
+        return "pymysql"
+
+
+@lru_cache(maxsize=1)
 def get_connection_string() -> str:
     db_config = get_db_config()
+    driver = get_mysql_driver()
     
     # Add SSL parameters for cloud databases
     ssl_disabled = os.getenv("DB_SSL_DISABLED", "false").lower() == "true"
     
     base_url = (
-        f"mysql+pymysql://{db_config['username']}:{db_config['password']}"
+        f"mysql+{driver}://{db_config['username']}:{db_config['password']}"
         f"@{db_config['host']}:{db_config['port']}/{db_config['database']}"
     )
+
+    # mysqlclient takes its SSL settings through connect_args only
+    if driver != "pymysql":
+        return base_url
     
     # Add SSL parameters if SSL is enabled (default for cloud databases)
     if not ssl_disabled:
@@ -31,47 +66,102 @@ def get_connection_string() -> str:
         return f"{base_url}?ssl_disabled=true"
 
 
-# Instantiate the engine ONCE at module level
-ssl_disabled = os.getenv("DB_SSL_DISABLED", "false").lower() == "true"
-
-if ssl_disabled:
-    # For local development without SSL
-    engine: Engine = create_engine(get_connection_string())
-else:
+def get_connect_args() -> Dict:
+    """Driver-level connect arguments, derived from the SSL environment settings."""
+    if os.getenv("DB_SSL_DISABLED", "false").lower() == "true":
+        # For local development without SSL
+        return {}
     # For cloud databases with SSL
-    engine: Engine = create_engine(
-        get_connection_string(),
-        connect_args={"ssl_disabled": False}
-    )
+    if get_mysql_driver() == "pymysql":
+        return {"ssl_disabled": False}
+    ssl_ca = os.getenv("DB_SSL_CA")
+    if ssl_ca:
+        return {"ssl": {"ca": ssl_ca}}
+    # PREFERRED matches the PyMySQL setup: TLS when the server offers it, a
+    # plain connection otherwise. DB_SSL_MODE=REQUIRED refuses the fallback.
+    return {"ssl_mode": os.getenv("DB_SSL_MODE", "PREFERRED")}
+
+
+# Connection pool tuning, overridable per deployment
+POOL_OPTIONS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "20")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "30")),
+    "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+    # Recycle before MySQL's wait_timeout (or a load balancer) drops idle connections
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "3600")),
+    "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+    # Reuse the most recently returned connection so a few stay warm and the
+    # rest can idle out, instead of round-robining through the whole pool
+    "pool_use_lifo": os.getenv("DB_POOL_USE_LIFO", "true").lower() == "true",
+}
+
+# Instantiate the engine ONCE at module level; every caller shares its pool
+engine: Engine = create_engine(
+    get_connection_string(),
+    connect_args=get_connect_args(),
+    **POOL_OPTIONS,
+)
+
+SessionLocal = sessionmaker(bind=engine, autoflush=False)
+
 
-SessionLocal = sessionmaker(bind=engine)
+def get_engine() -> Engine:
+    """Return the process-wide engine; patch this rather than creating another."""
+    return engine
+
+
+def warm_pool() -> None:
+    """Open pool_size connections up front so early requests skip the handshake."""
+    connections = [engine.connect() for _ in range(engine.pool.size())]
+    try:
+        for connection in connections:
+            connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+def get_db() -> Iterator[Session]:
+    """FastAPI dependency yielding one session per request, closed afterwards."""
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
 
 
 class Database:
+    # Reflected schema shared by every instance; populated on first use
+    _reflected_tables: Optional[Dict[str, Table]] = None
+    _reflect_lock = threading.Lock()
+
     def __init__(self):
-        self._engine = engine
-        # commented this line since it always get old or stale data
-        # self._session = SessionLocal()
+        self._engine = get_engine()
         self._tables = self._get_tables()
 
     @property
     def engine(self) -> Engine:
         return self._engine
 
-    @property
-    def session(self) -> Session:
-        # return self._session
-        # added this line to get fresh data
-        return SessionLocal()
-
     @property
     def tables(self) -> Dict[str, Table]:
         return self._tables
 
     def _get_tables(self) -> Dict[str, Table]:
+        # Reflection issues a round-trip per table, so only do it once per process
+        with Database._reflect_lock:
+            if Database._reflected_tables is None:
+                Database._reflected_tables = self._reflect_tables()
+        return Database._reflected_tables
+
+    def _reflect_tables(self) -> Dict[str, Table]:
         metadata = MetaData()
         metadata.reflect(bind=self.engine)
-        return {
-            table_name: Table(table_name, metadata, autoload_with=self.engine)
-            for table_name in metadata.tables
-        }
+        # reflect() already populates every Table; no second autoload needed
+        return dict(metadata.tables)
+
+
+@lru_cache(maxsize=1)
+def get_tables() -> Dict[str, Table]:
+    """Reflected tables for this process; usable directly or as Depends(get_tables)."""
+    return Database().tables
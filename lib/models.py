@@ -1,20 +1,24 @@
-from pydantic import BaseModel, EmailStr, constr
-from typing import Optional
+from pydantic import BaseModel, EmailStr, StringConstraints
+from typing import Annotated, Optional
 from fastapi import UploadFile
 
+# Shared constrained types, built once instead of a constr() call per field
+NonEmptyStr = Annotated[str, StringConstraints(min_length=1)]
+PasswordStr = Annotated[str, StringConstraints(min_length=8)]
+AccountUuidStr = Annotated[str, StringConstraints(min_length=32)]
+
 
 class AccountModel(BaseModel):
     email: EmailStr
-    password: constr(min_length=8)
+    password: PasswordStr
     role_id: int
-    profile_picture: Optional[bytes] = None
 
 
 # TODO: add is_verified for email verification
 class UserModel(BaseModel):
     account_id: int
-    first_name: constr(min_length=1)
-    last_name: constr(min_length=1)
+    first_name: NonEmptyStr
+    last_name: NonEmptyStr
     bio: Optional[str] = None
     profile_picture: Optional[UploadFile] = None  # TODO: change to string (path)
     uuid: str
@@ -23,7 +27,7 @@ class UserModel(BaseModel):
 # TODO: add is_verified for email verification
 class OrganizationModel(BaseModel):
     account_id: int
-    name: constr(min_length=1)
+    name: NonEmptyStr
     logo: Optional[UploadFile] = None  # TODO: change to string (path)
     category: str
     description: Optional[str] = None
@@ -31,7 +35,7 @@ class OrganizationModel(BaseModel):
 
 
 class SessionModel(BaseModel):
-    account_uuid: constr(min_length=32)
+    account_uuid: AccountUuidStr
 
 
 class PostModel(BaseModel):
@@ -43,7 +47,7 @@ class PostModel(BaseModel):
 
 class EventModel(BaseModel):
     account_uuid: str
-    title: constr(min_length=1)
+    title: NonEmptyStr
     event_date: str
     country: str
     province: str
@@ -1,82 +1,129 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse
-from fastapi.responses import FileResponse
+from fastapi.responses import ORJSONResponse, RedirectResponse
 import os
-import traceback
+import re
+import time
+import logging
+import anyio
+from lib.database import POOL_OPTIONS, get_tables, warm_pool
+from utils.cache_utils import RevalidateCachedResponses, init_cache
+from utils.rate_limit import limiter
+from slowapi import _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
+
+logger = logging.getLogger(__name__)
 
 
 
 # from .dependencies import get_query_token, get_token_header
 # from .internal import admin
 
-print("Starting to import routers...")
-
-try:
-    from routers import (
-        account,
-        resource,
-        user,
-        post,
-        event,
-        rsvp,
-        comment,
-        organization,
-        shares,
-        notification,
-        two_factor_auth,
-        report,
+from routers import (
+    account,
+    resource,
+    user,
+    post,
+    event,
+    rsvp,
+    comment,
+    organization,
+    shares,
+    notification,
+    two_factor_auth,
+    report,
+)
+
+ROUTERS = (
+    account,
+    resource,
+    user,
+    post,
+    event,
+    rsvp,
+    comment,
+    organization,
+    shares,
+    notification,
+    two_factor_auth,
+    report,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Reflect the schema once at startup and share it for the process lifetime
+    app.state.tables = get_tables()
+    # Sync handlers run in anyio's threadpool (40 threads by default). Some
+    # hold their get_db connection while a helper (add_session,
+    # NotificationService, resource/address utils) checks out a second one,
+    # so size it to half the connection pool: with a thread per connection,
+    # a burst can leave every thread holding one and waiting out
+    # pool_timeout for another. Keep THREADPOOL_SIZE overrides under that.
+    connections = POOL_OPTIONS["pool_size"] + POOL_OPTIONS["max_overflow"]
+    anyio.to_thread.current_default_thread_limiter().total_tokens = int(
+        os.getenv("THREADPOOL_SIZE", max(1, connections // 2))
     )
-    print("All routers imported successfully")
-except Exception as e:
-    print(f"Error importing routers: {str(e)}")
-    print(f"Traceback: {traceback.format_exc()}")
-    raise
+    # Opt-in with WARM_POOL=1: every worker and serverless cold start would
+    # otherwise open pool_size connections before serving any traffic
+    if os.getenv("WARM_POOL", "0") == "1":
+        started = time.perf_counter()
+        await run_in_threadpool(warm_pool)
+        logger.info("Connection pool warmed in %.3fs", time.perf_counter() - started)
+    yield
+
+
+# Initialised at import rather than in lifespan so cached routes still work on
+# hosts that never send ASGI lifespan events
+init_cache()
 
 # app = FastAPI(dependencies=[Depends(get_query_token)])
-app = FastAPI()
-app.include_router(account.router)
-app.include_router(resource.router)
-app.include_router(user.router)
-app.include_router(post.router)
-app.include_router(event.router)
-app.include_router(rsvp.router)
-app.include_router(comment.router)
-app.include_router(organization.router)
-app.include_router(shares.router)
-app.include_router(notification.router)
-app.include_router(two_factor_auth.router)
-app.include_router(report.router)
-
-# app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
-
-@app.get("/uploads/{file_path:path}")
-async def serve_file(file_path: str):
-    response = FileResponse(f"uploads/{file_path}")
-    return response
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+app.state.limiter = limiter
+app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+for module in ROUTERS:
+    app.include_router(module.router)
+
+# Comment listings and single posts are cleared from the cache on every
+# write, so browsers must revalidate them rather than reuse them for the TTL
+app.add_middleware(
+    RevalidateCachedResponses, path_prefixes=("/comment/", "/post/single/")
+)
+
+# StaticFiles offloads file I/O to a worker thread, rejects paths that
+# escape the directory and handles ETag/Last-Modified/Range requests.
+# check_dir=False lets the app start on hosts where uploads/ is absent.
+app.mount(
+    "/uploads",
+    StaticFiles(directory="uploads", check_dir=False),
+    name="uploads",
+)
 
 # Configure CORS
 frontend_url = os.getenv("FRONTEND_URL", "http://opencircle-fe.s3-website-ap-southeast-1.amazonaws.com")
-origins = [
-    frontend_url,
-    "http://opencircle-fe.s3-website-ap-southeast-1.amazonaws.com",
-    "https://opencircle-fe.s3-website-ap-southeast-1.amazonaws.com",
-    "http://localhost:5173",  # Fallback for local development
-    "http://127.0.0.1:5173",  # Fallback for local development
-]
-
-# Add production URL explicitly
-if (frontend_url != "http://opencircle-fe.s3-website-ap-southeast-1.amazonaws.com" 
-    and frontend_url != "https://opencircle-fe.s3-website-ap-southeast-1.amazonaws.com"):
-    origins.append("http://opencircle-fe.s3-website-ap-southeast-1.amazonaws.com")
-    origins.append("https://opencircle-fe.s3-website-ap-southeast-1.amazonaws.com")
+# The S3 frontend is always allowed over both schemes; sorted(set()) drops
+# duplicates when FRONTEND_URL already points at it
+origins = sorted(
+    {
+        frontend_url,
+        "http://opencircle-fe.s3-website-ap-southeast-1.amazonaws.com",
+        "https://opencircle-fe.s3-website-ap-southeast-1.amazonaws.com",
+        "http://localhost:5173",  # Fallback for local development
+        "http://127.0.0.1:5173",  # Fallback for local development
+    }
+)
 
 print(f"CORS origins configured: {origins}")
 
+# One anchored alternation, compiled once by Starlette, instead of a list scan
+origin_regex = "^(?:" + "|".join(re.escape(origin) for origin in origins) + ")$"
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=origins,
+    allow_origin_regex=origin_regex,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
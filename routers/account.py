@@ -1,5 +1,6 @@
 from fastapi import (
     APIRouter,
+    BackgroundTasks,
     HTTPException,
     Path,
     UploadFile,
@@ -10,26 +11,34 @@ from fastapi import (
     Cookie,
 )
 from pydantic import EmailStr, constr
-from lib.database import Database
+from lib.database import get_db, get_tables
+from fastapi import Depends
+from sqlalchemy.orm import Session
 from lib.models import UserModel, OrganizationModel
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from sqlalchemy import insert, select, or_, update
-import uuid
-import bcrypt
+from sqlalchemy import insert, select, or_, update, delete, bindparam, union_all
+from utils.id_utils import uuid7_hex
+from utils.password_utils import (
+    check_password,
+    hash_password,
+    needs_rehash,
+)
+from utils.rate_limit import SIGNIN_RATE_LIMIT, limiter
 from utils.user_utils import create_user
 from utils.organization_utils import create_organization
 from utils.two_factor_auth import TwoFactorAuth
 from utils.email_otp import get_email_otp_service
-import jwt
+from utils.cache_utils import cache_profile, get_cached_profile, invalidate_profile
 import os
 from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
 from typing import Optional
 from utils.session_utils import (
     add_session,
     delete_session,
     get_account_uuid_from_session,
+    invalidate_account_sessions,
 )
-from utils.datetime_utils import format_datetime
 
 
 router = APIRouter(
@@ -37,17 +46,174 @@ router = APIRouter(
     tags=["Account Management"],
 )
 
-db = Database()
-table = db.tables
-session = db.session
-engine = db.engine
+table = get_tables()
+
+# Bound once at import so request paths resolve tables with a global lookup
+ACCOUNT_TBL = table["account"]
+ORGANIZATION_TBL = table["organization"]
+RESOURCE_TBL = table["resource"]
+USER_TBL = table["user"]
 
-SECRET_KEY = os.environ.get("JWT_SECRET_KEY", "fallback-unsafe-key")
 SESSION_DURATION_MINUTES = 600  # 10 hours
 
+# Secure cookies only in production so local HTTP development keeps working
+IS_PRODUCTION = os.environ.get("ENVIRONMENT") == "production"
+
+# Attributes shared by every session cookie, fixed for the process lifetime
+_SESSION_COOKIE_ATTRS = "; HttpOnly; Path=/; SameSite=Lax" + (
+    "; Secure" if IS_PRODUCTION else ""
+)
+
+# Statements built once at import and executed with per-request parameters
+INSERT_ACCOUNT_STMT = insert(ACCOUNT_TBL)
+DELETE_ACCOUNT_BY_UUID_STMT = delete(ACCOUNT_TBL).where(
+    ACCOUNT_TBL.c.uuid == bindparam("account_uuid")
+)
+ACCOUNT_BY_UUID_STMT = select(
+    ACCOUNT_TBL.c.id,
+    ACCOUNT_TBL.c.uuid,
+    ACCOUNT_TBL.c.email,
+    ACCOUNT_TBL.c.role_id,
+    ACCOUNT_TBL.c.bypass_two_factor,
+).where(ACCOUNT_TBL.c.uuid == bindparam("account_uuid"))
+# verify_2fa also needs the 2FA secrets, which nothing else should fetch
+ACCOUNT_2FA_BY_UUID_STMT = select(
+    ACCOUNT_TBL.c.id,
+    ACCOUNT_TBL.c.uuid,
+    ACCOUNT_TBL.c.email,
+    ACCOUNT_TBL.c.username,
+    ACCOUNT_TBL.c.role_id,
+    ACCOUNT_TBL.c.bypass_two_factor,
+    ACCOUNT_TBL.c.two_factor_enabled,
+    ACCOUNT_TBL.c.totp_secret,
+    ACCOUNT_TBL.c.backup_codes,
+).where(ACCOUNT_TBL.c.uuid == bindparam("account_uuid"))
+# Each profile table joined to its picture/logo resource, with the columns
+# every profile payload reads; defined once and reused by the auth_user and
+# sign-in statements so the join can't drift between them
+USER_WITH_PICTURE = USER_TBL.outerjoin(
+    RESOURCE_TBL, USER_TBL.c.profile_picture == RESOURCE_TBL.c.id
+)
+USER_PROFILE_COLUMNS = (
+    USER_TBL.c.first_name,
+    USER_TBL.c.last_name,
+    USER_TBL.c.bio,
+    USER_TBL.c.profile_picture,
+    RESOURCE_TBL.c.directory.label("profile_picture_directory"),
+    RESOURCE_TBL.c.filename.label("profile_picture_filename"),
+)
+ORGANIZATION_WITH_LOGO = ORGANIZATION_TBL.outerjoin(
+    RESOURCE_TBL, ORGANIZATION_TBL.c.logo == RESOURCE_TBL.c.id
+)
+ORGANIZATION_PROFILE_COLUMNS = (
+    ORGANIZATION_TBL.c.name,
+    ORGANIZATION_TBL.c.logo,
+    ORGANIZATION_TBL.c.category,
+    ORGANIZATION_TBL.c.description,
+    RESOURCE_TBL.c.directory.label("logo_directory"),
+    RESOURCE_TBL.c.filename.label("logo_filename"),
+)
+# Profile lookups for an account already in hand; email/username come from
+# the account row, so only the resource table is joined
+USER_PROFILE_STMT = (
+    select(USER_TBL.c.id, USER_TBL.c.account_id, *USER_PROFILE_COLUMNS)
+    .select_from(USER_WITH_PICTURE)
+    .where(USER_TBL.c.account_id == bindparam("account_id"))
+)
+ORGANIZATION_PROFILE_STMT = (
+    select(
+        ORGANIZATION_TBL.c.id,
+        ORGANIZATION_TBL.c.account_id,
+        *ORGANIZATION_PROFILE_COLUMNS,
+    )
+    .select_from(ORGANIZATION_WITH_LOGO)
+    .where(ORGANIZATION_TBL.c.account_id == bindparam("account_id"))
+)
+ACCOUNT_CONFLICT_STMT = (
+    select(ACCOUNT_TBL.c.email)
+    .where(
+        or_(
+            ACCOUNT_TBL.c.email == bindparam("email"),
+            ACCOUNT_TBL.c.username == bindparam("username"),
+        )
+    )
+    .limit(1)
+)
+
+
+def _user_profile(account, user, user_id) -> dict:
+    # The /account/auth_user payload for a user. Sign-in passes its joined
+    # row as both account and user; auth_user and verify_2fa pass two rows
+    return {
+        "id": user_id,
+        "account_id": account.id,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "bio": user.bio,
+        "email": account.email,
+        "profile_picture": (
+            {
+                "id": user.profile_picture,
+                "directory": user.profile_picture_directory,
+                "filename": user.profile_picture_filename,
+            }
+            if user.profile_picture
+            else None
+        ),
+        "uuid": account.uuid,
+        "role_id": account.role_id,
+        "bypass_two_factor": account.bypass_two_factor,
+    }
+
+
+def _organization_profile(account, organization, organization_id) -> dict:
+    # The /account/auth_user payload for an organization
+    return {
+        "id": organization_id,
+        "account_id": account.id,
+        "name": organization.name,
+        "email": account.email,
+        "logo": (
+            {
+                "id": organization.logo,
+                "directory": organization.logo_directory,
+                "filename": organization.logo_filename,
+            }
+            if organization.logo
+            else None
+        ),
+        "category": organization.category,
+        "description": organization.description,
+        "uuid": account.uuid,
+        "role_id": account.role_id,
+        "bypass_two_factor": account.bypass_two_factor,
+    }
+
+
+def _duplicate_account_detail(
+    session: Session, error: IntegrityError, email: str, username: str
+) -> str:
+    # MySQL names the violated unique key in the duplicate-entry message
+    message = str(error.orig)
+    if "account_email_IDX" in message:
+        return "Email already exists"
+    if "account_username" in message:
+        return "Username already exists"
+    # Unrecognised message (other server/driver wording): look the row up,
+    # which only ever happens on this already-failed path
+    existing = session.execute(
+        ACCOUNT_CONFLICT_STMT, {"email": email, "username": username}
+    ).first()
+    if existing is not None and existing.email == email:
+        return "Email already exists"
+    if existing is not None:
+        return "Username already exists"
+    return "Email or username already exists"
+
 
 @router.post("/user", tags=["Create User Account"])
-async def create_user_account(
+def create_user_account(
+    background_tasks: BackgroundTasks,
     first_name: constr(min_length=1) = Form(...),
     last_name: constr(min_length=1) = Form(...),
     bio: str = Form(None),
@@ -55,60 +221,42 @@ async def create_user_account(
     email: EmailStr = Form(...),
     username: constr(min_length=3) = Form(...),
     password: constr(min_length=8) = Form(...),
+    session: Session = Depends(get_db),
 ):
     """
     Initiate user account creation with email OTP verification
     """
-    # Check if email or username already exists
-    check_stmt = select(table["account"]).where(
-        or_(table["account"].c.email == email, table["account"].c.username == username)
-    )
-    existing_account = session.execute(check_stmt).first()
-    if existing_account:
-        if existing_account.email == email:
-            raise HTTPException(status_code=400, detail="Email already exists")
-        else:
-            raise HTTPException(status_code=400, detail="Username already exists")
-
     try:
-        # Generate a UUID for the account
-        account_uuid = uuid.uuid4().hex
+        # Generate a time-ordered UUID for the account
+        account_uuid = uuid7_hex()
 
         # Hash the password securely
-        hashed_password = bcrypt.hashpw(
-            password.encode("utf-8"), bcrypt.gensalt()
-        ).decode("utf-8")
+        hashed_password = hash_password(password)
 
-        # Generate and send OTP
+        # Generate the OTP now; it is emailed only once the inserts commit
         email_otp_service = get_email_otp_service()
-        full_name = f"{first_name} {last_name}"
-        otp_result = email_otp_service.generate_and_send_otp(email, "user", full_name)
-
-        if not otp_result:
-            raise HTTPException(
-                status_code=500, detail="Failed to send verification email"
-            )
-
-        otp_code, otp_expires = otp_result
-
-        # Create account record with OTP (but not verified yet)
-        stmt = insert(table["account"]).values(
-            uuid=account_uuid,
-            email=email,
-            username=username,
-            password=hashed_password,
-            role_id=1,
-            email_otp_code=otp_code,
-            email_otp_expires=otp_expires,
-            email_verified=False,
-            otp_attempts=0,
+        otp_code = email_otp_service.generate_otp()
+        otp_expires = email_otp_service.get_otp_expiry()
+
+        # Create account record with OTP (but not verified yet). The unique
+        # email/username keys reject duplicates here, without a pre-check
+        result = session.execute(
+            INSERT_ACCOUNT_STMT,
+            {
+                "uuid": account_uuid,
+                "email": email,
+                "username": username,
+                "password": hashed_password,
+                "role_id": 1,
+                "email_otp_code": otp_code,
+                "email_otp_expires": otp_expires,
+                "email_verified": False,
+                "otp_attempts": 0,
+            },
         )
-
-        result = session.execute(stmt)
-        session.commit()  # Commit the account first
         account_id = result.inserted_primary_key[0]
 
-        # Now create the user record in a separate transaction
+        # Create the user record in the same transaction as the account
         create_user(
             UserModel(
                 account_id=account_id,
@@ -117,7 +265,20 @@ async def create_user_account(
                 bio=bio,
                 profile_picture=profile_picture,
                 uuid=account_uuid,
-            )
+            ),
+            session,
+        )
+
+        session.commit()
+
+        # The stored OTP is authoritative, so the email goes out after the
+        # response; a failed send can be retried via /account/resend-email-otp
+        background_tasks.add_task(
+            email_otp_service.send_otp_email,
+            email,
+            otp_code,
+            "user",
+            f"{first_name} {last_name}",
         )
 
         return {
@@ -127,18 +288,20 @@ async def create_user_account(
             "next_step": "POST /account/verify-email-otp with your OTP code",
         }
 
-    except IntegrityError:
+    except IntegrityError as e:
         session.rollback()
-        raise HTTPException(status_code=400, detail="Email or username already exists")
+        raise HTTPException(
+            status_code=400,
+            detail=_duplicate_account_detail(session, e, email, username),
+        )
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.post("/organization", tags=["Create Organization Account"])
-async def create_organization_account(
+def create_organization_account(
+    background_tasks: BackgroundTasks,
     name: constr(min_length=1) = Form(...),
     logo: Optional[UploadFile] = File(None),
     category: str = Form(...),
@@ -146,61 +309,42 @@ async def create_organization_account(
     email: EmailStr = Form(...),
     username: constr(min_length=3) = Form(...),
     password: constr(min_length=8) = Form(...),
+    session: Session = Depends(get_db),
 ):
     """
     Initiate organization account creation with email OTP verification
     """
-    # Check if email or username already exists
-    check_stmt = select(table["account"]).where(
-        or_(table["account"].c.email == email, table["account"].c.username == username)
-    )
-    existing_account = session.execute(check_stmt).first()
-    if existing_account:
-        if existing_account.email == email:
-            raise HTTPException(status_code=400, detail="Email already exists")
-        else:
-            raise HTTPException(status_code=400, detail="Username already exists")
-
     try:
-        # Generate a UUID for the account
-        account_uuid = uuid.uuid4().hex
+        # Generate a time-ordered UUID for the account
+        account_uuid = uuid7_hex()
 
         # Hash the password securely
-        hashed_password = bcrypt.hashpw(
-            password.encode("utf-8"), bcrypt.gensalt()
-        ).decode("utf-8")
+        hashed_password = hash_password(password)
 
-        # Generate and send OTP
+        # Generate the OTP now; it is emailed only once the inserts commit
         email_otp_service = get_email_otp_service()
-        otp_result = email_otp_service.generate_and_send_otp(
-            email, "organization", name
+        otp_code = email_otp_service.generate_otp()
+        otp_expires = email_otp_service.get_otp_expiry()
+
+        # Create account record with OTP (but not verified yet). The unique
+        # email/username keys reject duplicates here, without a pre-check
+        result = session.execute(
+            INSERT_ACCOUNT_STMT,
+            {
+                "uuid": account_uuid,
+                "email": email,
+                "username": username,
+                "password": hashed_password,
+                "role_id": 2,
+                "email_otp_code": otp_code,
+                "email_otp_expires": otp_expires,
+                "email_verified": False,
+                "otp_attempts": 0,
+            },
         )
-
-        if not otp_result:
-            raise HTTPException(
-                status_code=500, detail="Failed to send verification email"
-            )
-
-        otp_code, otp_expires = otp_result
-
-        # Create account record with OTP (but not verified yet)
-        stmt = insert(table["account"]).values(
-            uuid=account_uuid,
-            email=email,
-            username=username,
-            password=hashed_password,
-            role_id=2,
-            email_otp_code=otp_code,
-            email_otp_expires=otp_expires,
-            email_verified=False,
-            otp_attempts=0,
-        )
-
-        result = session.execute(stmt)
-        session.commit()  # Commit the account first
         account_id = result.inserted_primary_key[0]
 
-        # Now create the organization record in a separate transaction
+        # Create the organization record in the same transaction as the account
         create_organization(
             OrganizationModel(
                 account_id=account_id,
@@ -209,7 +353,16 @@ async def create_organization_account(
                 category=category,
                 description=description,
                 uuid=account_uuid,
-            )
+            ),
+            session,
+        )
+
+        session.commit()
+
+        # The stored OTP is authoritative, so the email goes out after the
+        # response; a failed send can be retried via /account/resend-email-otp
+        background_tasks.add_task(
+            email_otp_service.send_otp_email, email, otp_code, "organization", name
         )
 
         return {
@@ -219,20 +372,22 @@ async def create_organization_account(
             "next_step": "POST /account/verify-email-otp with your OTP code",
         }
 
-    except IntegrityError:
+    except IntegrityError as e:
         session.rollback()
-        raise HTTPException(status_code=400, detail="Email or username already exists")
+        raise HTTPException(
+            status_code=400,
+            detail=_duplicate_account_detail(session, e, email, username),
+        )
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.delete("/uuid/{account_uuid}", tags=["Delete Account"])
-async def delete_account_by_uuid(
+def delete_account_by_uuid(
     account_uuid: str = Path(..., description="The UUID of the account to delete"),
     session_token: str = Cookie(None),
+    session: Session = Depends(get_db),
 ):
     if not session_token:
         raise HTTPException(status_code=401, detail="Session token missing")
@@ -243,73 +398,151 @@ async def delete_account_by_uuid(
             status_code=403, detail="You are not authorized to delete this account"
         )
     # Proceed with deletion
-    delete_stmt = (
-        table["account"].delete().where(table["account"].c.uuid == account_uuid)
-    )
     try:
-        result = session.execute(delete_stmt)
+        result = session.execute(
+            DELETE_ACCOUNT_BY_UUID_STMT, {"account_uuid": account_uuid}
+        )
         session.commit()
         if result.rowcount == 0:
             raise HTTPException(status_code=404, detail="Account not found")
         # Optionally, delete session after account deletion
         delete_session(session_token)
+        # Other sessions were removed by the FK cascade; forget them here too
+        invalidate_account_sessions(account_uuid)
+        invalidate_profile(account_uuid)
         return {"message": "Account deleted successfully"}
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
+
+
+# Sign-in fetches the account and its profile in one round trip; the
+# profile columns are NULL when the account is of the other type
+_USER_SIGNIN_SELECT = (
+    select(
+        ACCOUNT_TBL.c.id,
+        ACCOUNT_TBL.c.uuid,
+        ACCOUNT_TBL.c.email,
+        ACCOUNT_TBL.c.username,
+        ACCOUNT_TBL.c.password,
+        ACCOUNT_TBL.c.role_id,
+        ACCOUNT_TBL.c.email_verified,
+        ACCOUNT_TBL.c.two_factor_enabled,
+        ACCOUNT_TBL.c.bypass_two_factor,
+        USER_TBL.c.id.label("user_id"),
+        *USER_PROFILE_COLUMNS,
+    )
+    .select_from(
+        ACCOUNT_TBL.outerjoin(
+            USER_WITH_PICTURE, USER_TBL.c.account_id == ACCOUNT_TBL.c.id
+        )
+    )
+)
+
+_ORGANIZATION_SIGNIN_SELECT = (
+    select(
+        ACCOUNT_TBL.c.id,
+        ACCOUNT_TBL.c.uuid,
+        ACCOUNT_TBL.c.email,
+        ACCOUNT_TBL.c.username,
+        ACCOUNT_TBL.c.password,
+        ACCOUNT_TBL.c.role_id,
+        ACCOUNT_TBL.c.email_verified,
+        ACCOUNT_TBL.c.two_factor_enabled,
+        ACCOUNT_TBL.c.bypass_two_factor,
+        ORGANIZATION_TBL.c.id.label("organization_id"),
+        *ORGANIZATION_PROFILE_COLUMNS,
+    )
+    .select_from(
+        ACCOUNT_TBL.outerjoin(
+            ORGANIZATION_WITH_LOGO,
+            ORGANIZATION_TBL.c.account_id == ACCOUNT_TBL.c.id,
+        )
+    )
+)
+
+
+def _by_login(signin_select):
+    # Email and username are each a unique key, so the login becomes two
+    # single-row key lookups instead of an OR the optimizer may index-merge
+    # or scan
+    return union_all(
+        signin_select.where(ACCOUNT_TBL.c.email == bindparam("login")),
+        signin_select.where(ACCOUNT_TBL.c.username == bindparam("login")),
+    ).limit(1)
+
+
+USER_SIGNIN_STMT = _by_login(_USER_SIGNIN_SELECT)
+ORGANIZATION_SIGNIN_STMT = _by_login(_ORGANIZATION_SIGNIN_SELECT)
+
+
+def _set_session_cookie(
+    response: Response, key: str, value: str, *, expires=None, max_age=None
+):
+    # Tokens are URL-safe, so the Set-Cookie header is built directly rather
+    # than through Response.set_cookie's SimpleCookie quoting round trip.
+    cookie = f"{key}={value}"
+    if expires is not None:
+        cookie += f"; Expires={format_datetime(expires, usegmt=True)}"
+    if max_age is not None:
+        cookie += f"; Max-Age={max_age}"
+    response.raw_headers.append(
+        (b"set-cookie", (cookie + _SESSION_COOKIE_ATTRS).encode("latin-1"))
+    )
+
+
+def _rehash_password_if_needed(
+    session: Session, account_id: int, hashed_password: str, password: str
+):
+    # Upgrade hashes made with an older BCRYPT_ROUNDS while we hold the plaintext
+    if not needs_rehash(hashed_password):
+        return
+    session.execute(
+        update(ACCOUNT_TBL)
+        .where(ACCOUNT_TBL.c.id == account_id)
+        .values(password=hash_password(password))
+    )
+    session.commit()
 
 
 @router.post("/user_signin", tags=["User Sign In"])
-async def user_sign_in(
+@limiter.limit(SIGNIN_RATE_LIMIT)
+def user_sign_in(
     login: str = Form(..., description="Email or username"),
     password: constr(min_length=8) = Form(...),
     request: Request = None,
     response: Response = None,
+    session: Session = Depends(get_db),
 ):
-    session = db.session
-    # Find account by email or username
-    stmt = select(table["account"]).where(
-        or_(table["account"].c.email == login, table["account"].c.username == login)
-    )
-    account_result = session.execute(stmt).first()
-    if not account_result:
-        raise HTTPException(status_code=401, detail="Invalid credentials")
-    account = account_result._mapping
+    # Find account by email or username, together with its user profile
+    account = session.execute(USER_SIGNIN_STMT, {"login": login}).first()
 
-    # Check password
-    if not bcrypt.checkpw(
-        password.encode("utf-8"), account["password"].encode("utf-8")
-    ):
+    # Check password; unknown logins are checked against a dummy hash so both
+    # failure cases cost one bcrypt and take the same branch
+    hashed_password = account.password if account else None
+    if not check_password(password, hashed_password) or not account:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    _rehash_password_if_needed(session, account.id, account.password, password)
 
     # Check if email is verified
-    if not account.get("email_verified", False):
+    if not account.email_verified:
         raise HTTPException(
             status_code=403,
             detail="Email not verified. Please check your email for verification code or request a new one.",
         )
 
     # Check if 2FA is enabled
-    if account["two_factor_enabled"]:
+    if account.two_factor_enabled:
         # Store account_uuid in a temporary session for 2FA verification
         temp_session_details = add_session(
-            account_uuid=account["uuid"],
+            account_uuid=account.uuid,
             request=request,
         )
         temp_session_token = temp_session_details["session_token"]
-        is_production = os.environ.get("ENVIRONMENT") == "production"
-
-        response.set_cookie(
-            key="temp_session_token",
-            value=temp_session_token,
-            httponly=True,
-            secure=is_production,
-            samesite="Lax",
-            # samesite="None",
-            path="/",
-            max_age=300,  # 5 minutes for 2FA verification
+
+        # 5 minutes for 2FA verification
+        _set_session_cookie(
+            response, "temp_session_token", temp_session_token, max_age=300
         )
 
         return {
@@ -318,135 +551,74 @@ async def user_sign_in(
             "account_type": "user",
         }
 
-    # Get user details linked to account, join resource for profile picture
-    user_stmt = (
-        select(
-            table["user"].c.id,
-            table["user"].c.account_id,
-            table["user"].c.first_name,
-            table["user"].c.last_name,
-            table["user"].c.bio,
-            table["account"].c.email,
-            table["account"].c.username,
-            table["user"].c.profile_picture,
-            table["resource"].c.directory.label("profile_picture_directory"),
-            table["resource"].c.filename.label("profile_picture_filename"),
-        )
-        .select_from(
-            table["user"]
-            .join(
-                table["account"],
-                table["user"].c.account_id == table["account"].c.id,
-            )
-            .outerjoin(
-                table["resource"],
-                table["user"].c.profile_picture == table["resource"].c.id,
-            )
-        )
-        .where(table["user"].c.account_id == account["id"])
-    )
-    user_result = session.execute(user_stmt).first()
-    if not user_result:
+    if account.user_id is None:
         raise HTTPException(status_code=404, detail="User not found for this account")
-    user = user_result._mapping
 
     # Create session and set cookie
     session_details = add_session(
-        account_uuid=account["uuid"],
+        account_uuid=account.uuid,
         request=request,
     )
     session_token = session_details["session_token"]
     expires_at = session_details["expires_at"]
-    is_production = os.environ.get("ENVIRONMENT") == "production"
-
-    response.set_cookie(
-        key="session_token",
-        value=session_token,
-        httponly=True,
-        secure=is_production,  # True for HTTPS in production, False for local HTTP
-        samesite="Lax",
-        # samesite="None",
-        path="/",
-        expires=expires_at,
+
+    _set_session_cookie(
+        response, "session_token", session_token, expires=expires_at
     )
 
-    # Return user details (do NOT return session token in body)
+    # Return user details (do NOT return session token in body). This is
+    # also the payload /account/auth_user serves, so cache it for the
+    # frontend's first call after signing in
+    user = _user_profile(account, account, account.user_id)
+    cache_profile(account.uuid, {"user": user})
+
     return {
-        "user": {
-            "id": user["id"],
-            "account_id": user["account_id"],
-            "first_name": user["first_name"],
-            "last_name": user["last_name"],
-            "bio": user["bio"],
-            "email": account["email"],
-            "username": account["username"],
-            "profile_picture": (
-                {
-                    "id": user["profile_picture"],
-                    "directory": user["profile_picture_directory"],
-                    "filename": user["profile_picture_filename"],
-                }
-                if user["profile_picture"]
-                else None
-            ),
-            "uuid": account["uuid"],
-            "role_id": account["role_id"],  # Include role_id from account table
-            "bypass_two_factor": account["bypass_two_factor"],
-        },
-        "expires_at": format_datetime(expires_at),
+        "user": {**user, "username": account.username},
+        "expires_at": expires_at,
     }
 
 
 @router.post("/organization_signin", tags=["Organization Sign In"])
-async def organization_sign_in(
+@limiter.limit(SIGNIN_RATE_LIMIT)
+def organization_sign_in(
     login: str = Form(..., description="Email or username"),
     password: constr(min_length=8) = Form(...),
     request: Request = None,
     response: Response = None,
+    session: Session = Depends(get_db),
 ):
-    session = db.session
-    # Find account by email or username
-    stmt = select(table["account"]).where(
-        or_(table["account"].c.email == login, table["account"].c.username == login)
-    )
-    account_result = session.execute(stmt).first()
-    if not account_result:
-        raise HTTPException(status_code=401, detail="Invalid credentials")
-    account = account_result._mapping
-
-    # Check password
-    if not bcrypt.checkpw(
-        password.encode("utf-8"), account["password"].encode("utf-8")
-    ):
+    # Find account by email or username, together with its organization
+    account = session.execute(
+        ORGANIZATION_SIGNIN_STMT, {"login": login}
+    ).first()
+
+    # Check password; unknown logins are checked against a dummy hash so both
+    # failure cases cost one bcrypt and take the same branch
+    hashed_password = account.password if account else None
+    if not check_password(password, hashed_password) or not account:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    _rehash_password_if_needed(session, account.id, account.password, password)
 
     # Check if email is verified
-    if not account.get("email_verified", False):
+    if not account.email_verified:
         raise HTTPException(
             status_code=403,
             detail="Email not verified. Please check your email for verification code or request a new one.",
         )
 
     # Check if 2FA is enabled
-    if account["two_factor_enabled"]:
+    if account.two_factor_enabled:
 
         # Store account_uuid in a temporary session for 2FA verification
         temp_session_details = add_session(
-            account_uuid=account["uuid"],
+            account_uuid=account.uuid,
             request=request,
         )
         temp_session_token = temp_session_details["session_token"]
-        is_production = os.environ.get("ENVIRONMENT") == "production"
-
-        response.set_cookie(
-            key="temp_session_token",
-            value=temp_session_token,
-            httponly=True,
-            secure=is_production,
-            samesite="Lax",
-            # samesite="None",
-            path="/",
-            max_age=300,  # 5 minutes for 2FA verification
+
+        # 5 minutes for 2FA verification
+        _set_session_cookie(
+            response, "temp_session_token", temp_session_token, max_age=300
         )
 
         return {
@@ -455,89 +627,37 @@ async def organization_sign_in(
             "account_type": "organization",
         }
 
-    # Get organization details linked to account, join resource for logo
-    org_stmt = (
-        select(
-            table["organization"].c.id,
-            table["organization"].c.account_id,
-            table["organization"].c.name,
-            table["organization"].c.logo,
-            table["organization"].c.category,
-            table["organization"].c.description,
-            table["account"].c.email,
-            table["account"].c.username,
-            table["resource"].c.directory.label("logo_directory"),
-            table["resource"].c.filename.label("logo_filename"),
-        )
-        .select_from(
-            table["organization"]
-            .join(
-                table["account"],
-                table["organization"].c.account_id == table["account"].c.id,
-            )
-            .outerjoin(
-                table["resource"],
-                table["organization"].c.logo == table["resource"].c.id,
-            )
-        )
-        .where(table["organization"].c.account_id == account["id"])
-    )
-    org_result = session.execute(org_stmt).first()
-    if not org_result:
+    if account.organization_id is None:
         raise HTTPException(
             status_code=404, detail="Organization not found for this account"
         )
-    organization = org_result._mapping
 
     # Create session and set cookie
     session_details = add_session(
-        account_uuid=account["uuid"],
+        account_uuid=account.uuid,
         request=request,
     )
     session_token = session_details["session_token"]
     expires_at = session_details["expires_at"]
-    is_production = os.environ.get("ENVIRONMENT") == "production"
-
-    response.set_cookie(
-        key="session_token",
-        value=session_token,
-        httponly=True,
-        secure=is_production,  # True for HTTPS in production, False for local HTTP
-        samesite="Lax",
-        # samesite="None",
-        path="/",
-        expires=expires_at,
+
+    _set_session_cookie(
+        response, "session_token", session_token, expires=expires_at
     )
 
-    # Return organization details (do NOT return session token in body)
+    # Return organization details (do NOT return session token in body).
+    # This is also the payload /account/auth_user serves, so cache it for the
+    # frontend's first call after signing in
+    organization = _organization_profile(account, account, account.organization_id)
+    cache_profile(account.uuid, {"organization": organization})
+
     return {
-        "organization": {
-            "id": organization["id"],
-            "account_id": organization["account_id"],
-            "name": organization["name"],
-            "email": account["email"],
-            "username": account["username"],
-            "logo": (
-                {
-                    "id": organization["logo"],
-                    "directory": organization["logo_directory"],
-                    "filename": organization["logo_filename"],
-                }
-                if organization["logo"]
-                else None
-            ),
-            "category": organization["category"],
-            "description": organization["description"],
-            "uuid": account["uuid"],
-            "role_id": account["role_id"],  # Include role_id from account table
-            "bypass_two_factor": account["bypass_two_factor"],
-        },
-        "expires_at": format_datetime(expires_at),
+        "organization": {**organization, "username": account.username},
+        "expires_at": expires_at,
     }
 
 
 @router.post("/logout", tags=["Logout"])
-async def logout(response: Response, session_token: str = Cookie(None)):
+def logout(response: Response, session_token: str = Cookie(None)):
     if not session_token:
         raise HTTPException(status_code=401, detail="Session token missing")
     try:
@@ -555,7 +675,10 @@ async def logout(response: Response, session_token: str = Cookie(None)):
 
 
 @router.get("/auth_user", tags=["Get Current User"])
-async def get_current_user(session_token: str = Cookie(None)):
+def get_current_user(
+    session_token: str = Cookie(None),
+    session: Session = Depends(get_db),
+):
     if not session_token:
         raise HTTPException(status_code=401, detail="Session token missing")
 
@@ -563,130 +686,51 @@ async def get_current_user(session_token: str = Cookie(None)):
         # Use utility function to get account_uuid from session
         account_uuid = get_account_uuid_from_session(session_token)
 
+        cached = get_cached_profile(account_uuid)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+
         # Get account details
-        account_stmt = select(table["account"]).where(
-            table["account"].c.uuid == account_uuid
-        )
-        account_result = session.execute(account_stmt).first()
-        if not account_result:
+        account = session.execute(
+            ACCOUNT_BY_UUID_STMT, {"account_uuid": account_uuid}
+        ).first()
+        if not account:
             raise HTTPException(status_code=404, detail="Account not found")
-        account = account_result._mapping
 
         # Check if user or organization based on role_id
-        if account["role_id"] == 1:  # User
+        if account.role_id == 1:  # User
             # Get user details linked to account, join resource for profile picture
-            user_stmt = (
-                select(
-                    table["user"].c.id,
-                    table["user"].c.account_id,
-                    table["user"].c.first_name,
-                    table["user"].c.last_name,
-                    table["user"].c.bio,
-                    table["account"].c.email,
-                    table["user"].c.profile_picture,
-                    table["resource"].c.directory.label("profile_picture_directory"),
-                    table["resource"].c.filename.label("profile_picture_filename"),
-                )
-                .select_from(
-                    table["user"]
-                    .join(
-                        table["account"],
-                        table["user"].c.account_id == table["account"].c.id,
-                    )
-                    .outerjoin(
-                        table["resource"],
-                        table["user"].c.profile_picture == table["resource"].c.id,
-                    )
-                )
-                .where(table["user"].c.account_id == account["id"])
-            )
-            user_result = session.execute(user_stmt).first()
-            if not user_result:
+            user = session.execute(
+                USER_PROFILE_STMT, {"account_id": account.id}
+            ).first()
+            if not user:
                 raise HTTPException(
                     status_code=404, detail="User not found for this account"
                 )
-            user = user_result._mapping
 
-            return {
-                "user": {
-                    "id": user["id"],
-                    "account_id": user["account_id"],
-                    "first_name": user["first_name"],
-                    "last_name": user["last_name"],
-                    "bio": user["bio"],
-                    "email": account["email"],
-                    "profile_picture": (
-                        {
-                            "id": user["profile_picture"],
-                            "directory": user["profile_picture_directory"],
-                            "filename": user["profile_picture_filename"],
-                        }
-                        if user["profile_picture"]
-                        else None
-                    ),
-                    "uuid": account["uuid"],
-                    "role_id": account["role_id"],
-                    "bypass_two_factor": account["bypass_two_factor"],
-                }
-            }
-        elif account["role_id"] == 2:  # Organization
+            profile = {"user": _user_profile(account, user, user.id)}
+        elif account.role_id == 2:  # Organization
             # Get organization details linked to account, join resource for logo
-            org_stmt = (
-                select(
-                    table["organization"].c.id,
-                    table["organization"].c.account_id,
-                    table["organization"].c.name,
-                    table["organization"].c.logo,
-                    table["organization"].c.category,
-                    table["organization"].c.description,
-                    table["account"].c.email,
-                    table["resource"].c.directory.label("logo_directory"),
-                    table["resource"].c.filename.label("logo_filename"),
-                )
-                .select_from(
-                    table["organization"]
-                    .join(
-                        table["account"],
-                        table["organization"].c.account_id == table["account"].c.id,
-                    )
-                    .outerjoin(
-                        table["resource"],
-                        table["organization"].c.logo == table["resource"].c.id,
-                    )
-                )
-                .where(table["organization"].c.account_id == account["id"])
-            )
-            org_result = session.execute(org_stmt).first()
-            if not org_result:
+            organization = session.execute(
+                ORGANIZATION_PROFILE_STMT, {"account_id": account.id}
+            ).first()
+            if not organization:
                 raise HTTPException(
                     status_code=404, detail="Organization not found for this account"
                 )
-            organization = org_result._mapping
 
-            return {
-                "organization": {
-                    "id": organization["id"],
-                    "account_id": organization["account_id"],
-                    "name": organization["name"],
-                    "email": account["email"],
-                    "logo": (
-                        {
-                            "id": organization["logo"],
-                            "directory": organization["logo_directory"],
-                            "filename": organization["logo_filename"],
-                        }
-                        if organization["logo"]
-                        else None
-                    ),
-                    "category": organization["category"],
-                    "description": organization["description"],
-                    "uuid": account["uuid"],
-                    "role_id": account["role_id"],
-                    "bypass_two_factor": account["bypass_two_factor"],
-                }
+            profile = {
+                "organization": _organization_profile(
+                    account, organization, organization.id
+                )
             }
         else:
             raise HTTPException(status_code=400, detail="Unknown account type")
+
+        return Response(
+            content=cache_profile(account_uuid, profile),
+            media_type="application/json",
+        )
     except HTTPException as e:
         # Re-raise HTTP exceptions to preserve status code and detail
         raise e
@@ -694,17 +738,16 @@ async def get_current_user(session_token: str = Cookie(None)):
         raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.post("/verify_2fa", tags=["Verify 2FA"])
-async def verify_2fa(
+def verify_2fa(
     totp_token: str = Form(..., description="6-digit TOTP token or backup code"),
     account_type: str = Form(..., description="Account type: user or organization"),
     temp_session_token: str = Cookie(None, alias="temp_session_token"),
     request: Request = None,
     response: Response = None,
+    session: Session = Depends(get_db),
 ):
     """
     Verify 2FA token and complete login
@@ -720,39 +763,36 @@ async def verify_2fa(
 
     try:
         # Get account details
-        account_stmt = select(table["account"]).where(
-            table["account"].c.uuid == account_uuid
-        )
-        account_result = session.execute(account_stmt).first()
-        if not account_result:
+        account = session.execute(
+            ACCOUNT_2FA_BY_UUID_STMT, {"account_uuid": account_uuid}
+        ).first()
+        if not account:
             raise HTTPException(status_code=404, detail="Account not found")
 
-        account = account_result._mapping
-
         # Verify that 2FA is enabled
-        if not account["two_factor_enabled"]:
+        if not account.two_factor_enabled:
             raise HTTPException(
                 status_code=400, detail="2FA is not enabled for this account"
             )
 
         # Verify TOTP token or backup code
         is_valid = False
-        updated_backup_codes = account["backup_codes"]
+        updated_backup_codes = account.backup_codes
 
         if len(totp_token) == 6 and totp_token.isdigit():
             # Verify TOTP token
-            is_valid = TwoFactorAuth.verify_totp(account["totp_secret"], totp_token)
+            is_valid = TwoFactorAuth.verify_totp(account.totp_secret, totp_token)
         else:
             # Try backup code
             is_valid, updated_backup_codes = TwoFactorAuth.verify_backup_code(
-                account["backup_codes"], totp_token
+                account.backup_codes, totp_token
             )
 
             # Update backup codes if one was used
-            if is_valid and updated_backup_codes != account["backup_codes"]:
+            if is_valid and updated_backup_codes != account.backup_codes:
                 update_stmt = (
-                    update(table["account"])
-                    .where(table["account"].c.uuid == account_uuid)
+                    update(ACCOUNT_TBL)
+                    .where(ACCOUNT_TBL.c.uuid == account_uuid)
                     .values(backup_codes=updated_backup_codes)
                 )
                 session.execute(update_stmt)
@@ -769,141 +809,51 @@ async def verify_2fa(
 
         # Create new permanent session
         session_details = add_session(
-            account_uuid=account["uuid"],
+            account_uuid=account.uuid,
             request=request,
         )
         session_token = session_details["session_token"]
         expires_at = session_details["expires_at"]
-        is_production = os.environ.get("ENVIRONMENT") == "production"
-
-        response.set_cookie(
-            key="session_token",
-            value=session_token,
-            httponly=True,
-            secure=is_production,  # True for HTTPS in production, False for local HTTP
-            samesite="Lax",
-            # samesite="None",  
-            path="/",
-            expires=expires_at,
+
+        _set_session_cookie(
+            response, "session_token", session_token, expires=expires_at
         )
 
         # Return appropriate account details based on type
         if account_type == "member":
             # Get user details
-            user_stmt = (
-                select(
-                    table["user"].c.id,
-                    table["user"].c.account_id,
-                    table["user"].c.first_name,
-                    table["user"].c.last_name,
-                    table["user"].c.bio,
-                    table["account"].c.email,
-                    table["account"].c.username,
-                    table["user"].c.profile_picture,
-                    table["resource"].c.directory.label("profile_picture_directory"),
-                    table["resource"].c.filename.label("profile_picture_filename"),
-                )
-                .select_from(
-                    table["user"]
-                    .join(
-                        table["account"],
-                        table["user"].c.account_id == table["account"].c.id,
-                    )
-                    .outerjoin(
-                        table["resource"],
-                        table["user"].c.profile_picture == table["resource"].c.id,
-                    )
-                )
-                .where(table["user"].c.account_id == account["id"])
-            )
-            user_result = session.execute(user_stmt).first()
-            if not user_result:
+            user = session.execute(
+                USER_PROFILE_STMT, {"account_id": account.id}
+            ).first()
+            if not user:
                 raise HTTPException(
                     status_code=404, detail="User not found for this account"
                 )
-            user = user_result._mapping
+
+            profile = _user_profile(account, user, user.id)
+            cache_profile(account.uuid, {"user": profile})
 
             return {
-                "user": {
-                    "id": user["id"],
-                    "account_id": user["account_id"],
-                    "first_name": user["first_name"],
-                    "last_name": user["last_name"],
-                    "bio": user["bio"],
-                    "email": account["email"],
-                    "username": account["username"],
-                    "profile_picture": (
-                        {
-                            "id": user["profile_picture"],
-                            "directory": user["profile_picture_directory"],
-                            "filename": user["profile_picture_filename"],
-                        }
-                        if user["profile_picture"]
-                        else None
-                    ),
-                    "uuid": account["uuid"],
-                    "role_id": account["role_id"],
-                    "bypass_two_factor": account["bypass_two_factor"],
-                },
-                "expires_at": format_datetime(expires_at),
+                "user": {**profile, "username": account.username},
+                "expires_at": expires_at,
             }
 
         elif account_type == "organization":
             # Get organization details
-            org_stmt = (
-                select(
-                    table["organization"].c.id,
-                    table["organization"].c.account_id,
-                    table["organization"].c.name,
-                    table["organization"].c.logo,
-                    table["organization"].c.category,
-                    table["organization"].c.description,
-                    table["account"].c.email,
-                    table["resource"].c.directory.label("logo_directory"),
-                    table["resource"].c.filename.label("logo_filename"),
-                )
-                .select_from(
-                    table["organization"]
-                    .join(
-                        table["account"],
-                        table["organization"].c.account_id == table["account"].c.id,
-                    )
-                    .outerjoin(
-                        table["resource"],
-                        table["organization"].c.logo == table["resource"].c.id,
-                    )
-                )
-                .where(table["organization"].c.account_id == account["id"])
-            )
-            org_result = session.execute(org_stmt).first()
-            if not org_result:
+            organization = session.execute(
+                ORGANIZATION_PROFILE_STMT, {"account_id": account.id}
+            ).first()
+            if not organization:
                 raise HTTPException(
                     status_code=404, detail="Organization not found for this account"
                 )
-            organization = org_result._mapping
+
+            profile = _organization_profile(account, organization, organization.id)
+            cache_profile(account.uuid, {"organization": profile})
 
             return {
-                "organization": {
-                    "id": organization["id"],
-                    "account_id": organization["account_id"],
-                    "name": organization["name"],
-                    "email": account["email"],
-                    "logo": (
-                        {
-                            "id": organization["logo"],
-                            "directory": organization["logo_directory"],
-                            "filename": organization["logo_filename"],
-                        }
-                        if organization["logo"]
-                        else None
-                    ),
-                    "category": organization["category"],
-                    "description": organization["description"],
-                    "uuid": account["uuid"],
-                    "role_id": account["role_id"],
-                    "bypass_two_factor": account["bypass_two_factor"],
-                },
-                "expires_at": format_datetime(expires_at),
+                "organization": profile,
+                "expires_at": expires_at,
             }
         else:
             raise HTTPException(status_code=400, detail="Invalid account type")
@@ -914,34 +864,87 @@ async def verify_2fa(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
+
+
+MAX_OTP_ATTEMPTS = 5
+
+# Email OTP lookups read only the verification columns; resend also joins
+# both profile tables so the recipient name comes back in the same query
+VERIFY_OTP_ACCOUNT_STMT = select(
+    ACCOUNT_TBL.c.role_id,
+    ACCOUNT_TBL.c.email_verified,
+    ACCOUNT_TBL.c.email_otp_code,
+    ACCOUNT_TBL.c.email_otp_expires,
+    ACCOUNT_TBL.c.otp_attempts,
+).where(ACCOUNT_TBL.c.email == bindparam("email"))
+# Conditional updates: the WHERE clause re-checks state in the same
+# statement, so rowcount says whether the write still applied. Binds must not
+# share a name with an account column, which SQLAlchemy reserves in UPDATEs.
+INCREMENT_OTP_ATTEMPTS_STMT = (
+    update(ACCOUNT_TBL)
+    .where(
+        ACCOUNT_TBL.c.email == bindparam("account_email"),
+        ACCOUNT_TBL.c.otp_attempts < bindparam("max_attempts"),
+    )
+    .values(otp_attempts=ACCOUNT_TBL.c.otp_attempts + 1)
+)
+ACTIVATE_ACCOUNT_STMT = (
+    update(ACCOUNT_TBL)
+    .where(
+        ACCOUNT_TBL.c.email == bindparam("account_email"),
+        ACCOUNT_TBL.c.email_otp_code == bindparam("otp_code"),
+        ACCOUNT_TBL.c.otp_attempts < bindparam("max_attempts"),
+    )
+    .values(
+        email_verified=True,
+        email_otp_code=None,
+        email_otp_expires=None,
+        otp_attempts=0,
+    )
+)
+RESEND_OTP_ACCOUNT_STMT = (
+    select(
+        ACCOUNT_TBL.c.role_id,
+        ACCOUNT_TBL.c.email_verified,
+        USER_TBL.c.id.label("user_id"),
+        USER_TBL.c.first_name,
+        USER_TBL.c.last_name,
+        ORGANIZATION_TBL.c.id.label("organization_id"),
+        ORGANIZATION_TBL.c.name,
+    )
+    .select_from(
+        ACCOUNT_TBL
+        .outerjoin(USER_TBL, USER_TBL.c.account_id == ACCOUNT_TBL.c.id)
+        .outerjoin(
+            ORGANIZATION_TBL, ORGANIZATION_TBL.c.account_id == ACCOUNT_TBL.c.id
+        )
+    )
+    .where(ACCOUNT_TBL.c.email == bindparam("email"))
+)
 
 
 @router.post("/verify-email-otp", tags=["Verify Email OTP"])
-async def verify_email_otp(
+def verify_email_otp(
     email: EmailStr = Form(...),
     otp_code: str = Form(..., description="6-digit OTP code from email"),
+    session: Session = Depends(get_db),
 ):
     """
     Verify email OTP and activate account
     """
     try:
         # Find account by email
-        account_stmt = select(table["account"]).where(table["account"].c.email == email)
-        account_result = session.execute(account_stmt).first()
+        account = session.execute(VERIFY_OTP_ACCOUNT_STMT, {"email": email}).first()
 
-        if not account_result:
+        if not account:
             raise HTTPException(status_code=404, detail="Account not found")
 
-        account = account_result._mapping
-
         # Check if account is already verified
-        if account["email_verified"]:
+        if account.email_verified:
             raise HTTPException(status_code=400, detail="Account is already verified")
 
         # Check OTP attempts
-        if account["otp_attempts"] >= 5:
+        if account.otp_attempts >= MAX_OTP_ATTEMPTS:
             raise HTTPException(
                 status_code=429,
                 detail="Too many verification attempts. Please request a new OTP code.",
@@ -952,20 +955,21 @@ async def verify_email_otp(
 
         # Verify OTP
         is_valid = email_otp_service.verify_otp(
-            otp_code, account["email_otp_code"], account["email_otp_expires"]
+            otp_code, account.email_otp_code, account.email_otp_expires
         )
 
         if not is_valid:
-            # Increment failed attempts
-            update_attempts_stmt = (
-                update(table["account"])
-                .where(table["account"].c.email == email)
-                .values(otp_attempts=account["otp_attempts"] + 1)
+            # Increment failed attempts in the database, so concurrent
+            # guesses can neither lose an increment nor pass the limit
+            result = session.execute(
+                INCREMENT_OTP_ATTEMPTS_STMT,
+                {"account_email": email, "max_attempts": MAX_OTP_ATTEMPTS},
             )
-            session.execute(update_attempts_stmt)
             session.commit()
 
-            remaining_attempts = 5 - (account["otp_attempts"] + 1)
+            remaining_attempts = (
+                MAX_OTP_ATTEMPTS - (account.otp_attempts + 1) if result.rowcount else 0
+            )
             if remaining_attempts <= 0:
                 raise HTTPException(
                     status_code=429,
@@ -977,22 +981,22 @@ async def verify_email_otp(
                     detail=f"Invalid or expired OTP code. {remaining_attempts} attempts remaining.",
                 )
 
-        # OTP is valid - activate the account
-        update_stmt = (
-            update(table["account"])
-            .where(table["account"].c.email == email)
-            .values(
-                email_verified=True,
-                email_otp_code=None,
-                email_otp_expires=None,
-                otp_attempts=0,
-            )
+        # OTP is valid - activate the account, unless a concurrent request
+        # replaced the code or used up the attempts since it was read
+        result = session.execute(
+            ACTIVATE_ACCOUNT_STMT,
+            {
+                "account_email": email,
+                "otp_code": account.email_otp_code,
+                "max_attempts": MAX_OTP_ATTEMPTS,
+            },
         )
-        session.execute(update_stmt)
         session.commit()
+        if not result.rowcount:
+            raise HTTPException(status_code=400, detail="Invalid or expired OTP code.")
 
         # Determine account type for response
-        account_type = "user" if account["role_id"] == 1 else "organization"
+        account_type = "user" if account.role_id == 1 else "organization"
 
         return {
             "message": f"Email verified successfully! Your {account_type} account is now active.",
@@ -1007,55 +1011,39 @@ async def verify_email_otp(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.post("/resend-email-otp", tags=["Resend Email OTP"])
-async def resend_email_otp(
+def resend_email_otp(
     email: EmailStr = Form(...),
+    session: Session = Depends(get_db),
 ):
     """
     Resend email OTP for account verification
     """
     try:
-        # Find account by email
-        account_stmt = select(table["account"]).where(table["account"].c.email == email)
-        account_result = session.execute(account_stmt).first()
+        # Find account by email, with its user or organization name
+        account = session.execute(RESEND_OTP_ACCOUNT_STMT, {"email": email}).first()
 
-        if not account_result:
+        if not account:
             raise HTTPException(status_code=404, detail="Account not found")
 
-        account = account_result._mapping
-
         # Check if account is already verified
-        if account["email_verified"]:
+        if account.email_verified:
             raise HTTPException(status_code=400, detail="Account is already verified")
 
         # Get account details for email
-        if account["role_id"] == 1:  # User
-            # Get user name
-            user_stmt = select(table["user"]).where(
-                table["user"].c.account_id == account["id"]
-            )
-            user_result = session.execute(user_stmt).first()
-            if not user_result:
+        if account.role_id == 1:  # User
+            if account.user_id is None:
                 raise HTTPException(status_code=404, detail="User details not found")
-            user = user_result._mapping
-            name = f"{user['first_name']} {user['last_name']}"
+            name = f"{account.first_name} {account.last_name}"
             account_type = "user"
         else:  # Organization
-            # Get organization name
-            org_stmt = select(table["organization"]).where(
-                table["organization"].c.account_id == account["id"]
-            )
-            org_result = session.execute(org_stmt).first()
-            if not org_result:
+            if account.organization_id is None:
                 raise HTTPException(
                     status_code=404, detail="Organization details not found"
                 )
-            org = org_result._mapping
-            name = org["name"]
+            name = account.name
             account_type = "organization"
 
         # Generate new OTP
@@ -1071,8 +1059,8 @@ async def resend_email_otp(
 
         # Update account with new OTP
         update_stmt = (
-            update(table["account"])
-            .where(table["account"].c.email == email)
+            update(ACCOUNT_TBL)
+            .where(ACCOUNT_TBL.c.email == email)
             .values(
                 email_otp_code=otp_code,
                 email_otp_expires=otp_expires,
@@ -1094,5 +1082,3 @@ async def resend_email_otp(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
\ No newline at end of file
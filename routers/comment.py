@@ -1,40 +1,116 @@
 from fastapi import APIRouter, HTTPException, Form
-from lib.database import Database
-from sqlalchemy import insert, update, delete, func
+from lib.database import get_db, get_tables
+from fastapi import Depends
+from sqlalchemy.orm import Session
+from fastapi_cache.decorator import cache
+from sqlalchemy import insert, update, delete, func, select, bindparam, or_, and_
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from fastapi import Cookie
-from utils.session_utils import get_account_uuid_from_session
+from utils.session_utils import current_account_uuid
 from utils.profanity_filter import moderate_text
 from utils.datetime_utils import format_datetime
+from utils.cache_utils import invalidate_namespace
+from datetime import datetime, timezone
+from typing import Optional
 
 router = APIRouter(
     prefix="/comment",
     tags=["Comment Management"],
 )
 
-db = Database()
-table = db.tables
-# session = db.session
+table = get_tables()
+
+# Namespace of the cached comment listings, cleared by every comment write
+COMMENTS_CACHE_NAMESPACE = "comments"
+
+# Bound once at import so request paths resolve tables with a global lookup
+ACCOUNT_TBL = table["account"]
+COMMENT_TBL = table["comment"]
+ORGANIZATION_TBL = table["organization"]
+RESOURCE_TBL = table["resource"]
+ROLE_TBL = table["role"]
+USER_TBL = table["user"]
+
+
+# Comment statements are built once at import; handlers only bind values,
+# so each request skips statement construction and hits SQLAlchemy's
+# compiled cache. Bind names avoid the comment columns, which are reserved
+# in VALUES/SET clauses.
+
+# The signed-in account's id as a scalar subquery, so each comment write is
+# one statement rather than an account lookup followed by the write
+AUTHOR_ID = (
+    select(ACCOUNT_TBL.c.id)
+    .where(ACCOUNT_TBL.c.uuid == bindparam("account_uuid"))
+    .scalar_subquery()
+)
+
+INSERT_COMMENT_STMT = insert(COMMENT_TBL).values(
+    post_id=bindparam("comment_post_id"),
+    event_id=bindparam("comment_event_id"),
+    author=AUTHOR_ID,
+    message=bindparam("comment_message"),
+)
+
+# Only the author may change or remove a comment
+UPDATE_COMMENT_STMT = (
+    update(COMMENT_TBL)
+    .where(COMMENT_TBL.c.id == bindparam("comment_id"))
+    .where(COMMENT_TBL.c.author == AUTHOR_ID)
+    .values(message=bindparam("comment_message"))
+)
+
+DELETE_COMMENT_STMT = (
+    delete(COMMENT_TBL)
+    .where(COMMENT_TBL.c.id == bindparam("comment_id"))
+    .where(COMMENT_TBL.c.author == AUTHOR_ID)
+)
+
+ORG_LOGO_TBL = RESOURCE_TBL.alias("org_logo")
+
+# Comments joined with their author's account, role and profile; the GETs
+# add the parent filter, ordering and paging
+COMMENT_LISTING_SELECT = select(
+    COMMENT_TBL.c.id,
+    COMMENT_TBL.c.author,
+    COMMENT_TBL.c.message,
+    COMMENT_TBL.c.created_date,
+    COMMENT_TBL.c.last_modified_date,
+    ACCOUNT_TBL.c.uuid.label("account_uuid"),
+    ACCOUNT_TBL.c.email.label("account_email"),
+    ACCOUNT_TBL.c.role_id.label("account_role_id"),
+    ROLE_TBL.c.name.label("role_name"),
+    USER_TBL.c.first_name.label("user_first_name"),
+    USER_TBL.c.last_name.label("user_last_name"),
+    USER_TBL.c.bio.label("user_bio"),
+    RESOURCE_TBL.c.directory.label("profile_picture_directory"),
+    RESOURCE_TBL.c.filename.label("profile_picture_filename"),
+    RESOURCE_TBL.c.id.label("profile_picture_id"),
+    ORGANIZATION_TBL.c.name.label("organization_name"),
+    ORGANIZATION_TBL.c.description.label("organization_description"),
+    ORG_LOGO_TBL.c.directory.label("organization_logo_directory"),
+    ORG_LOGO_TBL.c.filename.label("organization_logo_filename"),
+    ORG_LOGO_TBL.c.id.label("organization_logo_id"),
+).select_from(
+    COMMENT_TBL.join(ACCOUNT_TBL, COMMENT_TBL.c.author == ACCOUNT_TBL.c.id)
+    .join(ROLE_TBL, ACCOUNT_TBL.c.role_id == ROLE_TBL.c.id)
+    .outerjoin(USER_TBL, USER_TBL.c.account_id == ACCOUNT_TBL.c.id)
+    .outerjoin(RESOURCE_TBL, USER_TBL.c.profile_picture == RESOURCE_TBL.c.id)
+    .outerjoin(ORGANIZATION_TBL, ORGANIZATION_TBL.c.account_id == ACCOUNT_TBL.c.id)
+    .outerjoin(ORG_LOGO_TBL, ORGANIZATION_TBL.c.logo == ORG_LOGO_TBL.c.id)
+)
+
+# Every comment has exactly one author account and role, so the total comes
+# from the comment table alone instead of counting the joined query
+COMMENT_COUNT_SELECT = select(func.count(COMMENT_TBL.c.id))
 
 
 @router.post("/post", tags=["Add Comment to Post"])
-async def add_comment_to_post(
+def add_comment_to_post(
     post_id: int = Form(...),
     message: str = Form(...),
-    session_token: str = Cookie(...),
+    account_uuid: str = Depends(current_account_uuid),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
-    # Get account_uuid from session_token
-    account_uuid = get_account_uuid_from_session(session_token)
-    if not account_uuid:
-        raise HTTPException(status_code=401, detail="Invalid session token")
-
-    # Get account_id from uuid
-    account = session.query(table["account"]).filter_by(uuid=account_uuid).first()
-    if not account:
-        raise HTTPException(status_code=404, detail="Account not found")
-    account_id = account.id
-
     # Moderate message for profanity and toxicity
     if message:
         message_str = str(message)
@@ -52,12 +128,18 @@ async def add_comment_to_post(
         
         message = moderation_result["moderated_text"]
 
-    stmt = insert(table["comment"]).values(
-        post_id=post_id, event_id=None, author=account_id, message=message
-    )
     try:
-        session.execute(stmt)
+        session.execute(
+            INSERT_COMMENT_STMT,
+            {
+                "comment_post_id": post_id,
+                "comment_event_id": None,
+                "account_uuid": account_uuid,
+                "comment_message": message,
+            },
+        )
         session.commit()
+        invalidate_namespace(COMMENTS_CACHE_NAMESPACE)
         return {"message": "Comment added successfully"}
     except IntegrityError:
         session.rollback()
@@ -68,28 +150,15 @@ async def add_comment_to_post(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.post("/event", tags=["Add Comment to Event"])
-async def add_comment_to_event(
+def add_comment_to_event(
     event_id: int = Form(...),
     message: str = Form(...),
-    session_token: str = Cookie(...),
+    account_uuid: str = Depends(current_account_uuid),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
-    # Get account_uuid from session_token
-    account_uuid = get_account_uuid_from_session(session_token)
-    if not account_uuid:
-        raise HTTPException(status_code=401, detail="Invalid session token")
-
-    # Get account_id from uuid
-    account = session.query(table["account"]).filter_by(uuid=account_uuid).first()
-    if not account:
-        raise HTTPException(status_code=404, detail="Account not found")
-    account_id = account.id
-
     # Moderate message for profanity and toxicity
     if message:
         message_str = str(message)
@@ -107,12 +176,18 @@ async def add_comment_to_event(
         
         message = moderation_result["moderated_text"]
 
-    stmt = insert(table["comment"]).values(
-        event_id=event_id, post_id=None, author=account_id, message=message
-    )
     try:
-        session.execute(stmt)
+        session.execute(
+            INSERT_COMMENT_STMT,
+            {
+                "comment_event_id": event_id,
+                "comment_post_id": None,
+                "account_uuid": account_uuid,
+                "comment_message": message,
+            },
+        )
         session.commit()
+        invalidate_namespace(COMMENTS_CACHE_NAMESPACE)
         return {"message": "Comment added successfully"}
     except IntegrityError:
         session.rollback()
@@ -123,28 +198,15 @@ async def add_comment_to_event(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.put("/{comment_id}", tags=["Update Comment"])
-async def update_comment(
+def update_comment(
     comment_id: int,
     message: str = Form(...),
-    session_token: str = Cookie(...),
+    account_uuid: str = Depends(current_account_uuid),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
-    # Get account_uuid from session_token
-    account_uuid = get_account_uuid_from_session(session_token)
-    if not account_uuid:
-        raise HTTPException(status_code=401, detail="Invalid session token")
-
-    # Get account_id from uuid
-    account = session.query(table["account"]).filter_by(uuid=account_uuid).first()
-    if not account:
-        raise HTTPException(status_code=404, detail="Account not found")
-    account_id = account.id
-
     # Moderate message for profanity and toxicity
     if message:
         message_str = str(message)
@@ -162,20 +224,21 @@ async def update_comment(
         
         message = moderation_result["moderated_text"]
 
-    # Only allow update if the account is the author
-    stmt = (
-        update(table["comment"])
-        .where(table["comment"].c.id == comment_id)
-        .where(table["comment"].c.author == account_id)
-        .values(message=message)
-    )
     try:
-        result = session.execute(stmt)
+        result = session.execute(
+            UPDATE_COMMENT_STMT,
+            {
+                "comment_id": comment_id,
+                "account_uuid": account_uuid,
+                "comment_message": message,
+            },
+        )
         session.commit()
         if result.rowcount == 0:
             raise HTTPException(
                 status_code=404, detail="Comment not found or not owned by user"
             )
+        invalidate_namespace(COMMENTS_CACHE_NAMESPACE)
         return {"message": "Comment updated successfully"}
     except SQLAlchemyError as e:
         session.rollback()
@@ -183,40 +246,25 @@ async def update_comment(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.delete("/{comment_id}", tags=["Delete Comment"])
-async def delete_comment(
+def delete_comment(
     comment_id: int,
-    session_token: str = Cookie(...),
+    account_uuid: str = Depends(current_account_uuid),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
-    # Get account_uuid from session_token
-    account_uuid = get_account_uuid_from_session(session_token)
-    if not account_uuid:
-        raise HTTPException(status_code=401, detail="Invalid session token")
-
-    # Get account_id from uuid
-    account = session.query(table["account"]).filter_by(uuid=account_uuid).first()
-    if not account:
-        raise HTTPException(status_code=404, detail="Account not found")
-    account_id = account.id
-
-    # Only allow delete if the account is the author
-    stmt = (
-        delete(table["comment"])
-        .where(table["comment"].c.id == comment_id)
-        .where(table["comment"].c.author == account_id)
-    )
     try:
-        result = session.execute(stmt)
+        result = session.execute(
+            DELETE_COMMENT_STMT,
+            {"comment_id": comment_id, "account_uuid": account_uuid},
+        )
         session.commit()
         if result.rowcount == 0:
             raise HTTPException(
                 status_code=404, detail="Comment not found or not owned by user"
             )
+        invalidate_namespace(COMMENTS_CACHE_NAMESPACE)
         return {"message": "Comment deleted successfully"}
     except SQLAlchemyError as e:
         session.rollback()
@@ -224,220 +272,142 @@ async def delete_comment(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
-@router.get("/event/{event_id}", tags=["Get Comments for Event"])
-async def get_comments_for_event(event_id: int, limit: int = 10, offset: int = 0):
-    session = db.session
-    try:
-        org_logo = table["resource"].alias("org_logo")
-        # Join role table to get role name
-        query = (
-            session.query(
-                table["comment"].c.id,
-                table["comment"].c.author,
-                table["comment"].c.message,
-                table["comment"].c.created_date,
-                table["comment"].c.last_modified_date,
-                table["account"].c.uuid.label("account_uuid"),
-                table["account"].c.email.label("account_email"),
-                table["account"].c.role_id.label("account_role_id"),
-                table["role"].c.name.label("role_name"),
-                table["user"].c.first_name.label("user_first_name"),
-                table["user"].c.last_name.label("user_last_name"),
-                table["user"].c.bio.label("user_bio"),
-                table["resource"].c.directory.label("profile_picture_directory"),
-                table["resource"].c.filename.label("profile_picture_filename"),
-                table["resource"].c.id.label("profile_picture_id"),
-                table["organization"].c.name.label("organization_name"),
-                table["organization"].c.description.label("organization_description"),
-                org_logo.c.directory.label("organization_logo_directory"),
-                org_logo.c.filename.label("organization_logo_filename"),
-                org_logo.c.id.label("organization_logo_id"),
-            )
-            .join(table["account"], table["comment"].c.author == table["account"].c.id)
-            .join(table["role"], table["account"].c.role_id == table["role"].c.id)
-            .outerjoin(
-                table["user"],
-                table["user"].c.account_id == table["account"].c.id,
-            )
-            .outerjoin(
-                table["resource"],
-                table["user"].c.profile_picture == table["resource"].c.id,
-            )
-            .outerjoin(
-                table["organization"],
-                table["organization"].c.account_id == table["account"].c.id,
-            )
-            .outerjoin(
-                org_logo,
-                table["organization"].c.logo == org_logo.c.id,
-            )
-            .filter(table["comment"].c.event_id == event_id)
-            .order_by(table["comment"].c.created_date.desc())
-        )
-        total = query.count()
-        comments = query.offset(offset).limit(limit).all()
-        result = []
-        for c in comments:
-            role_name = getattr(c, "role_name", None)
-            if role_name == "organization":
-                profile = {
-                    "organization_name": getattr(c, "organization_name", None),
-                    "organization_description": getattr(
-                        c, "organization_description", None
-                    ),
-                    "organization_logo": (
-                        {
-                            "id": getattr(c, "organization_logo_id", None),
-                            "directory": getattr(
-                                c, "organization_logo_directory", None
-                            ),
-                            "filename": getattr(c, "organization_logo_filename", None),
-                        }
-                        if getattr(c, "organization_logo_id", None)
-                        else None
-                    ),
-                }
-            else:
-                profile = {
-                    "user_first_name": getattr(c, "user_first_name", None),
-                    "user_last_name": getattr(c, "user_last_name", None),
-                    "user_bio": getattr(c, "user_bio", None),
-                    "profile_picture": (
-                        {
-                            "id": getattr(c, "profile_picture_id", None),
-                            "directory": getattr(c, "profile_picture_directory", None),
-                            "filename": getattr(c, "profile_picture_filename", None),
-                        }
-                        if getattr(c, "profile_picture_id", None)
-                        else None
-                    ),
+def _before_cursor(before_created: datetime, before_id: int):
+    # created_date is stored as naive UTC; cursors come back as the "Z"
+    # strings format_datetime produced, which parse as aware datetimes
+    if before_created.tzinfo is not None:
+        before_created = before_created.astimezone(timezone.utc).replace(tzinfo=None)
+    return or_(
+        COMMENT_TBL.c.created_date < before_created,
+        and_(
+            COMMENT_TBL.c.created_date == before_created,
+            COMMENT_TBL.c.id < before_id,
+        ),
+    )
+
+
+def _next_cursor(comments, limit: int):
+    # Pass back as before_created/before_id to fetch the following page
+    if len(comments) < limit:
+        return None
+    last = comments[-1]
+    return {"before_created": format_datetime(last.created_date), "before_id": last.id}
+
+
+def _comment_payload(c):
+    # Every listed column is labelled in the query, so rows are read by
+    # attribute; only the profile fields for the author's role are included
+    if c.role_name == "organization":
+        profile = {
+            "organization_name": c.organization_name,
+            "organization_description": c.organization_description,
+            "organization_logo": (
+                {
+                    "id": c.organization_logo_id,
+                    "directory": c.organization_logo_directory,
+                    "filename": c.organization_logo_filename,
                 }
-            result.append(
+                if c.organization_logo_id
+                else None
+            ),
+        }
+    else:
+        profile = {
+            "user_first_name": c.user_first_name,
+            "user_last_name": c.user_last_name,
+            "user_bio": c.user_bio,
+            "profile_picture": (
                 {
-                    "id": c.id,
-                    "author": c.author,
-                    "message": c.message,
-                    "created_date": format_datetime(c.created_date),
-                    "last_modified_date": format_datetime(c.last_modified_date),
-                    "account_uuid": getattr(c, "account_uuid", None),
-                    "account_email": getattr(c, "account_email", None),
-                    "role": role_name,
-                    **profile,
+                    "id": c.profile_picture_id,
+                    "directory": c.profile_picture_directory,
+                    "filename": c.profile_picture_filename,
                 }
-            )
-        return {"comments": result, "total": total, "limit": limit, "offset": offset}
+                if c.profile_picture_id
+                else None
+            ),
+        }
+    return {
+        "id": c.id,
+        "author": c.author,
+        "message": c.message,
+        "created_date": format_datetime(c.created_date),
+        "last_modified_date": format_datetime(c.last_modified_date),
+        "account_uuid": c.account_uuid,
+        "account_email": c.account_email,
+        "role": c.role_name,
+        **profile,
+    }
+
+
+@router.get("/event/{event_id}", tags=["Get Comments for Event"])
+@cache(expire=30, namespace=COMMENTS_CACHE_NAMESPACE)
+def get_comments_for_event(
+    event_id: int,
+    limit: int = 10,
+    offset: int = 0,
+    before_created: Optional[datetime] = None,
+    before_id: Optional[int] = None,
+    session: Session = Depends(get_db),
+):
+    try:
+        stmt = COMMENT_LISTING_SELECT.where(
+            COMMENT_TBL.c.event_id == event_id
+        ).order_by(COMMENT_TBL.c.created_date.desc(), COMMENT_TBL.c.id.desc())
+        total = session.execute(
+            COMMENT_COUNT_SELECT.where(COMMENT_TBL.c.event_id == event_id)
+        ).scalar()
+        if before_created is not None and before_id is not None:
+            # Keyset page: continue after the cursor instead of skipping
+            # `offset` rows, so deep pages cost the same as the first
+            stmt = stmt.where(_before_cursor(before_created, before_id))
+        else:
+            stmt = stmt.offset(offset)
+        comments = session.execute(stmt.limit(limit)).all()
+        result = [_comment_payload(c) for c in comments]
+        return {
+            "comments": result,
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "next_cursor": _next_cursor(comments, limit),
+        }
     except SQLAlchemyError as e:
         raise HTTPException(status_code=500, detail="Database error: " + str(e))
-    finally:
-        session.close()
 
 
 @router.get("/post/{post_id}", tags=["Get Comments for Post"])
-async def get_comments_for_post(post_id: int, limit: int = 10, offset: int = 0):
-    session = db.session
+@cache(expire=30, namespace=COMMENTS_CACHE_NAMESPACE)
+def get_comments_for_post(
+    post_id: int,
+    limit: int = 10,
+    offset: int = 0,
+    before_created: Optional[datetime] = None,
+    before_id: Optional[int] = None,
+    session: Session = Depends(get_db),
+):
     try:
-        org_logo = table["resource"].alias("org_logo")
-        query = (
-            session.query(
-                table["comment"].c.id,
-                table["comment"].c.author,
-                table["comment"].c.message,
-                table["comment"].c.created_date,
-                table["comment"].c.last_modified_date,
-                table["account"].c.uuid.label("account_uuid"),
-                table["account"].c.email.label("account_email"),
-                table["account"].c.role_id.label("account_role_id"),
-                table["role"].c.name.label("role_name"),
-                table["user"].c.first_name.label("user_first_name"),
-                table["user"].c.last_name.label("user_last_name"),
-                table["user"].c.bio.label("user_bio"),
-                table["resource"].c.directory.label("profile_picture_directory"),
-                table["resource"].c.filename.label("profile_picture_filename"),
-                table["resource"].c.id.label("profile_picture_id"),
-                table["organization"].c.name.label("organization_name"),
-                table["organization"].c.description.label("organization_description"),
-                org_logo.c.directory.label("organization_logo_directory"),
-                org_logo.c.filename.label("organization_logo_filename"),
-                org_logo.c.id.label("organization_logo_id"),
-            )
-            .join(table["account"], table["comment"].c.author == table["account"].c.id)
-            .join(table["role"], table["account"].c.role_id == table["role"].c.id)
-            .outerjoin(
-                table["user"],
-                table["user"].c.account_id == table["account"].c.id,
-            )
-            .outerjoin(
-                table["resource"],
-                table["user"].c.profile_picture == table["resource"].c.id,
-            )
-            .outerjoin(
-                table["organization"],
-                table["organization"].c.account_id == table["account"].c.id,
-            )
-            .outerjoin(
-                org_logo,
-                table["organization"].c.logo == org_logo.c.id,
-            )
-            .filter(table["comment"].c.post_id == post_id)
-            .order_by(table["comment"].c.created_date.desc())
-        )
-        total = query.count()
-        comments = query.offset(offset).limit(limit).all()
-        result = []
-        for c in comments:
-            role_name = getattr(c, "role_name", None)
-            if role_name == "organization":
-                profile = {
-                    "organization_name": getattr(c, "organization_name", None),
-                    "organization_description": getattr(
-                        c, "organization_description", None
-                    ),
-                    "organization_logo": (
-                        {
-                            "id": getattr(c, "organization_logo_id", None),
-                            "directory": getattr(
-                                c, "organization_logo_directory", None
-                            ),
-                            "filename": getattr(c, "organization_logo_filename", None),
-                        }
-                        if getattr(c, "organization_logo_id", None)
-                        else None
-                    ),
-                }
-            else:
-                profile = {
-                    "user_first_name": getattr(c, "user_first_name", None),
-                    "user_last_name": getattr(c, "user_last_name", None),
-                    "user_bio": getattr(c, "user_bio", None),
-                    "profile_picture": (
-                        {
-                            "id": getattr(c, "profile_picture_id", None),
-                            "directory": getattr(c, "profile_picture_directory", None),
-                            "filename": getattr(c, "profile_picture_filename", None),
-                        }
-                        if getattr(c, "profile_picture_id", None)
-                        else None
-                    ),
-                }
-            result.append(
-                {
-                    "id": c.id,
-                    "author": c.author,
-                    "message": c.message,
-                    "created_date": format_datetime(c.created_date),
-                    "last_modified_date": format_datetime(c.last_modified_date),
-                    "account_uuid": getattr(c, "account_uuid", None),
-                    "account_email": getattr(c, "account_email", None),
-                    "role": role_name,
-                    **profile,
-                }
-            )
-        return {"comments": result, "total": total, "limit": limit, "offset": offset}
+        stmt = COMMENT_LISTING_SELECT.where(
+            COMMENT_TBL.c.post_id == post_id
+        ).order_by(COMMENT_TBL.c.created_date.desc(), COMMENT_TBL.c.id.desc())
+        total = session.execute(
+            COMMENT_COUNT_SELECT.where(COMMENT_TBL.c.post_id == post_id)
+        ).scalar()
+        if before_created is not None and before_id is not None:
+            # Keyset page: continue after the cursor instead of skipping
+            # `offset` rows, so deep pages cost the same as the first
+            stmt = stmt.where(_before_cursor(before_created, before_id))
+        else:
+            stmt = stmt.offset(offset)
+        comments = session.execute(stmt.limit(limit)).all()
+        result = [_comment_payload(c) for c in comments]
+        return {
+            "comments": result,
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "next_cursor": _next_cursor(comments, limit),
+        }
     except SQLAlchemyError as e:
         raise HTTPException(status_code=500, detail="Database error: " + str(e))
-    finally:
-        session.close()
\ No newline at end of file
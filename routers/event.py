@@ -10,7 +10,9 @@ from fastapi import (
     Cookie,
 )
 from pydantic import BaseModel, constr
-from lib.database import Database
+from lib.database import get_db, get_tables
+from fastapi import Depends
+from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy import insert, select, func
 from typing import Optional
@@ -30,9 +32,7 @@ router = APIRouter(
     tags=["Event Management"],
 )
 
-db = Database()
-table = db.tables
-# session = db.session
+table = get_tables()
 
 
 def address_dict(row):
@@ -51,7 +51,7 @@ def address_dict(row):
 
 
 @router.post("/", tags=["Create Event"])
-async def create_event(
+def create_event(
     title: str = Form(...),
     event_date: str = Form(...),
     country: str = Form(...),
@@ -66,8 +66,8 @@ async def create_event(
     description: str = Form(...),
     image: Optional[UploadFile] = File(None),
     session_token: str = Cookie(None, alias="session_token"),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     notification_service = NotificationService()
     
     try:
@@ -191,11 +191,11 @@ async def create_event(
 
 
 @router.delete("/{event_id}", tags=["Delete Event"])
-async def delete_event(
+def delete_event(
     event_id: int = Path(..., description="ID of the event to delete"),
     session_token: str = Cookie(None, alias="session_token"),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     notification_service = NotificationService()
     
     try:
@@ -266,15 +266,14 @@ async def delete_event(
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        session.close()
         notification_service.close()
 
 
 @router.get("/", tags=["Get all Events and Show RSVP Status of User Per Event"])
-async def get_events(
-    account_uuid: str = Query(..., description="Account UUID to check RSVP status")
+def get_events(
+    account_uuid: str = Query(..., description="Account UUID to check RSVP status"),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     try:
         # Get account_id from uuid
         select_account = select(table["account"].c.id).where(
@@ -393,7 +392,7 @@ async def get_events(
 
 
 @router.put("/{event_id}", tags=["Update Event"])
-async def update_event(
+def update_event(
     event_id: int = Path(..., description="ID of the event to update"),
     title: Optional[str] = Form(None),
     event_date: Optional[str] = Form(None),
@@ -409,8 +408,8 @@ async def update_event(
     description: Optional[str] = Form(None),
     image: Optional[UploadFile] = File(None),
     session_token: str = Cookie(None, alias="session_token"),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     notification_service = NotificationService()
     
     try:
@@ -568,15 +567,14 @@ async def update_event(
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        session.close()
         notification_service.close()
 
 
 @router.get("/{event_id}/rsvps", tags=["Get RSVPs for Event"])
-async def get_event_rsvps(
-    event_id: int = Path(..., description="ID of the event to get RSVPs for")
+def get_event_rsvps(
+    event_id: int = Path(..., description="ID of the event to get RSVPs for"),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     try:
         # Check if event exists
         select_event = select(table["event"].c.id).where(
@@ -642,13 +640,13 @@ async def get_event_rsvps(
 
 # modified original function to include pagination and frequency total for events, event's members & requests
 @router.get("/organizer/active", tags=["Get Active Events by Organizer"])
-async def get_active_events_by_organizer(
+def get_active_events_by_organizer(
     account_uuid: str = Query(..., description="Account UUID of the organizer"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(5, ge=1, le=100, description="Events per page"),
     session_token: Optional[str] = Cookie(None, alias="session_token"),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     try:
         # Get organization id from account_uuid
         select_organization = (
@@ -1125,13 +1123,13 @@ async def get_active_events_by_organizer(
 
 
 @router.get("/organizer/past", tags=["Get Past Events by Organizer"])
-async def get_past_events_by_organizer(
+def get_past_events_by_organizer(
     account_uuid: str = Query(..., description="Account UUID of the organizer"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(5, ge=1, le=100, description="Events per page"),
     session_token: Optional[str] = Cookie(None, alias="session_token"),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     try:
         # Get organization id from account_uuid
         select_organization = (
@@ -1607,12 +1605,12 @@ async def get_past_events_by_organizer(
 
 
 @router.get("/organizer/by_month_year", tags=["Get Events by Month and Year"])
-async def get_events_by_month_year(
+def get_events_by_month_year(
     account_uuid: str = Query(..., description="Account UUID of the organizer"),
     month: int = Query(..., ge=1, le=12, description="Month (1-12)"),
     year: int = Query(..., ge=1900, description="Year (e.g., 2024)"),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     try:
         # Get organization id from account_uuid
         select_organization = (
@@ -2111,14 +2109,14 @@ async def get_events_by_month_year(
 
 
 @router.get("/by_status_with_comments", tags=["Get Events By Status With Comments"])
-async def get_events_by_status_with_comments(
+def get_events_by_status_with_comments(
     status: str = Query(
         "active", description="Event status (e.g., active, cancelled, etc.)"
     ),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=100, description="Events per page (max 100)"),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     try:
         offset = (page - 1) * limit
 
@@ -2213,12 +2211,12 @@ async def get_events_by_status_with_comments(
 
 
 @router.get("/all_with_comments", tags=["Get All Events With Comments"])
-async def get_all_events_with_comments(
+def get_all_events_with_comments(
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(5, ge=1, le=20, description="Events per page (max 20)"),
     session_token: Optional[str] = Cookie(None, alias="session_token"),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     try:
         offset = (page - 1) * limit
 
@@ -2523,17 +2521,15 @@ async def get_all_events_with_comments(
         raise HTTPException(status_code=500, detail="Database error: " + str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.get("/user/rsvped", tags=["Get User RSVPed Events By Month and Year"])
-async def get_user_rsvped_events_by_month_year(
+def get_user_rsvped_events_by_month_year(
     account_uuid: str = Query(..., description="Account UUID of the user"),
     month: int = Query(..., ge=1, le=12, description="Month (1-12)"),
     year: int = Query(..., ge=1900, description="Year (e.g., 2024)"),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     try:
         # Get account_id from uuid
         select_account = select(table["account"].c.id).where(
@@ -2829,12 +2825,12 @@ async def get_user_rsvped_events_by_month_year(
 
 
 @router.get("/user/events_with_comments", tags=["Get User Events With Comments"])
-async def get_user_events_with_comments(
+def get_user_events_with_comments(
     account_uuid: str = Query(..., description="Account UUID of the user"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=100, description="Events per page (max 100)"),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     try:
         offset = (page - 1) * limit
 
@@ -3108,15 +3104,15 @@ async def get_user_events_with_comments(
     "/user/events_by_rsvp_status_with_comments",
     tags=["Get User Events By RSVP Status With Comments"],
 )
-async def get_user_events_by_rsvp_status_with_comments(
+def get_user_events_by_rsvp_status_with_comments(
     account_uuid: str = Query(..., description="Account UUID of the user"),
     rsvp_status: str = Query(
         ..., description="RSVP status (e.g., joined, pending, declined)"
     ),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=100, description="Events per page (max 100)"),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     try:
         offset = (page - 1) * limit
 
@@ -3428,10 +3424,10 @@ async def get_user_events_by_rsvp_status_with_comments(
 
 
 @router.get("/{event_id}", tags=["Get Event By ID"])
-async def get_event_by_id(
-    event_id: int = Path(..., description="ID of the event to retrieve")
+def get_event_by_id(
+    event_id: int = Path(..., description="ID of the event to retrieve"),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     try:
         # Create an alias for the resource table for organization logo
         logo_resource = table["resource"].alias("logo_resource")
@@ -3551,11 +3547,11 @@ async def get_event_by_id(
 
 
 @router.get("/{event_id}/with_comments", tags=["Get Event By ID With Comments"])
-async def get_event_by_id_with_comments(
+def get_event_by_id_with_comments(
     event_id: int = Path(..., description="ID of the event to retrieve"),
     account_uuid: str = Query(..., description="Account UUID of the user"),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     try:
         # Get account_id from uuid if provided
         account_id = None
@@ -3824,12 +3820,12 @@ async def get_event_by_id_with_comments(
 @router.get(
     "/user/past_events_with_comments", tags=["Get User Past Events With Comments"]
 )
-async def get_user_past_events_with_comments(
+def get_user_past_events_with_comments(
     account_uuid: str = Query(..., description="Account UUID of the user"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=100, description="Events per page (max 100)"),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     try:
         offset = (page - 1) * limit
 
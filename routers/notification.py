@@ -2,7 +2,9 @@ from fastapi import APIRouter, HTTPException, Query, Path
 from fastapi import Request
 from utils.session_utils import get_account_uuid_from_session
 from utils.notification_service import NotificationService, NotificationResponse
-from lib.database import Database
+from lib.database import get_db, get_tables
+from fastapi import Depends
+from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from typing import List, Optional
 
@@ -11,15 +13,15 @@ router = APIRouter(
     tags=["Notification Management"],
 )
 
-db = Database()
-table = db.tables
+table = get_tables()
 
 
 @router.get("/", tags=["Get User Notifications"])
-async def get_user_notifications(
+def get_user_notifications(
     request: Request,
     unread_only: bool = Query(False, description="Get only unread notifications"),
     limit: int = Query(50, ge=1, le=100, description="Maximum number of notifications to return"),
+    session: Session = Depends(get_db),
 ):
     """Get notifications for the authenticated user."""
     # Get session_token from cookie
@@ -30,7 +32,6 @@ async def get_user_notifications(
     # Use utility function to get account_uuid from session
     account_uuid = get_account_uuid_from_session(session_token)
     
-    session = db.session
     notification_service = NotificationService()
     
     try:
@@ -55,12 +56,11 @@ async def get_user_notifications(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        session.close()
         notification_service.close()
 
 
 @router.get("/count/unread", tags=["Get Unread Notification Count"])
-async def get_unread_notification_count(request: Request):
+def get_unread_notification_count(request: Request, session: Session = Depends(get_db)):
     """Get the count of unread notifications for the authenticated user."""
     # Get session_token from cookie
     session_token = request.cookies.get("session_token")
@@ -70,7 +70,6 @@ async def get_unread_notification_count(request: Request):
     # Use utility function to get account_uuid from session
     account_uuid = get_account_uuid_from_session(session_token)
     
-    session = db.session
     notification_service = NotificationService()
     
     try:
@@ -87,14 +86,14 @@ async def get_unread_notification_count(request: Request):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        session.close()
         notification_service.close()
 
 
 @router.put("/{notification_id}/read", tags=["Mark Notification as Read"])
-async def mark_notification_as_read(
+def mark_notification_as_read(
     notification_id: int = Path(..., description="ID of the notification to mark as read"),
     request: Request = None,
+    session: Session = Depends(get_db),
 ):
     """Mark a specific notification as read."""
     # Get session_token from cookie
@@ -105,7 +104,6 @@ async def mark_notification_as_read(
     # Use utility function to get account_uuid from session
     account_uuid = get_account_uuid_from_session(session_token)
     
-    session = db.session
     notification_service = NotificationService()
     
     try:
@@ -133,12 +131,14 @@ async def mark_notification_as_read(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        session.close()
         notification_service.close()
 
 
 @router.put("/read-all", tags=["Mark All Notifications as Read"])
-async def mark_all_notifications_as_read(request: Request):
+def mark_all_notifications_as_read(
+    request: Request,
+    session: Session = Depends(get_db),
+):
     """Mark all notifications for the authenticated user as read."""
     # Get session_token from cookie
     session_token = request.cookies.get("session_token")
@@ -148,7 +148,6 @@ async def mark_all_notifications_as_read(request: Request):
     # Use utility function to get account_uuid from session
     account_uuid = get_account_uuid_from_session(session_token)
     
-    session = db.session
     notification_service = NotificationService()
     
     try:
@@ -175,14 +174,14 @@ async def mark_all_notifications_as_read(request: Request):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        session.close()
         notification_service.close()
 
 
 @router.delete("/{notification_id}", tags=["Delete Notification"])
-async def delete_notification(
+def delete_notification(
     notification_id: int = Path(..., description="ID of the notification to delete"),
     request: Request = None,
+    session: Session = Depends(get_db),
 ):
     """Delete a specific notification."""
     # Get session_token from cookie
@@ -193,7 +192,6 @@ async def delete_notification(
     # Use utility function to get account_uuid from session
     account_uuid = get_account_uuid_from_session(session_token)
     
-    session = db.session
     notification_service = NotificationService()
     
     try:
@@ -221,5 +219,4 @@ async def delete_notification(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        session.close()
         notification_service.close()
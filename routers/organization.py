@@ -1,5 +1,8 @@
 from fastapi import APIRouter, HTTPException, Form, Path
-from lib.database import Database
+from lib.database import get_db, get_tables
+from fastapi import Depends
+from sqlalchemy.orm import Session
+from fastapi_cache.decorator import cache
 from sqlalchemy import insert, update, select
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from fastapi import Cookie
@@ -14,16 +17,15 @@ router = APIRouter(
     tags=["Organization Management"],
 )
 
-db = Database()
-table = db.tables
+table = get_tables()
 
 
 @router.post("/join", tags=["Join Organization"])
-async def join_organization(
+def join_organization(
     organization_id: int = Form(...),
     session_token: str = Cookie(None, alias="session_token"),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     notification_service = NotificationService()
 
     # Validate session token
@@ -119,16 +121,15 @@ async def join_organization(
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        session.close()
         notification_service.close()
 
 
 @router.post("/leave", tags=["Leave Organization"])
-async def leave_organization(
+def leave_organization(
     organization_id: int = Form(...),
     session_token: str = Cookie(None, alias="session_token"),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     # Validate session token
     if not session_token:
         raise HTTPException(status_code=401, detail="Session token missing")
@@ -173,20 +174,18 @@ async def leave_organization(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.post("/leave-organization", tags=["Leave Organization"])
-async def leave_organization_status(
+def leave_organization_status(
     organization_id: int = Form(...),
     session_token: str = Cookie(None, alias="session_token"),
+    session: Session = Depends(get_db),
 ):
     """
     Leave an organization by setting membership status to 'left'.
     This preserves the membership record for historical purposes.
     """
-    session = db.session
 
     # Validate session token
     if not session_token:
@@ -249,17 +248,15 @@ async def leave_organization_status(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.put("/membership/status", tags=["Change Membership Status"])
-async def change_membership_status(
+def change_membership_status(
     user_id: int = Form(...),
     status: str = Form(...),
     session_token: str = Cookie(None, alias="session_token"),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     notification_service = NotificationService()
 
     # Validate session token
@@ -321,13 +318,11 @@ async def change_membership_status(
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        session.close()
         notification_service.close()
 
 
 @router.get("/memberships", tags=["Get User Memberships"])
-async def get_user_memberships(account_uuid: str):
-    session = db.session
+def get_user_memberships(account_uuid: str, session: Session = Depends(get_db)):
     try:
         # Get user_id by joining user and account tables
         user = (
@@ -452,19 +447,17 @@ async def get_user_memberships(account_uuid: str):
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.get("/user/joined", tags=["Get User Joined Organizations"])
-async def get_user_joined_organizations(
+def get_user_joined_organizations(
     account_uuid: str,
     session_token: str = Cookie(None, alias="session_token"),
+    session: Session = Depends(get_db),
 ):
     """
     Get all organizations that a user has joined (approved membership)
     """
-    session = db.session
 
     # Validate session token if provided (optional for this endpoint)
     visitor_user_id = None
@@ -610,13 +603,13 @@ async def get_user_joined_organizations(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.get("/pending-membership", tags=["Get Pending Membership Organization"])
-async def get_pending_membership_organization(account_uuid: str):
-    session = db.session
+def get_pending_membership_organization(
+    account_uuid: str,
+    session: Session = Depends(get_db),
+):
     try:
         # Get user_id by joining user and account tables
         user = (
@@ -707,15 +700,13 @@ async def get_pending_membership_organization(account_uuid: str):
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.get("/pending-applications", tags=["Get Pending Membership Applications"])
-async def get_pending_membership_applications(
+def get_pending_membership_applications(
     session_token: str = Cookie(None, alias="session_token"),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     # Validate session token
     if not session_token:
         raise HTTPException(status_code=401, detail="Session token missing")
@@ -784,15 +775,13 @@ async def get_pending_membership_applications(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.get("/rejected-applications", tags=["Get Rejected Membership Applications"])
-async def get_rejected_membership_applications(
+def get_rejected_membership_applications(
     session_token: str = Cookie(None, alias="session_token"),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     # Validate session token
     if not session_token:
         raise HTTPException(status_code=401, detail="Session token missing")
@@ -861,13 +850,10 @@ async def get_rejected_membership_applications(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.get("/organization-members", tags=["Get Organization Members"])
-async def get_organization_members(organization_id: int):
-    session = db.session
+def get_organization_members(organization_id: int, session: Session = Depends(get_db)):
     try:
         # Get organization with logo details
         org = (
@@ -962,15 +948,13 @@ async def get_organization_members(organization_id: int):
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.post("/membership-status", tags=["Get Membership Status"])
-async def get_membership_status(
-    account_uuids: list[str] = Form(...), organization_id: int = Form(...)
+def get_membership_status(
+    account_uuids: list[str] = Form(...), organization_id: int = Form(...),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     try:
         # Get user_ids for the provided account_uuids
         users = (
@@ -1016,13 +1000,11 @@ async def get_membership_status(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.get("/search", tags=["Search Organizations"])
-async def search_organizations(query: str):
-    session = db.session
+@cache(expire=60, namespace="organizations")
+def search_organizations(query: str, session: Session = Depends(get_db)):
     try:
         organizations = (
             session.query(
@@ -1090,16 +1072,14 @@ async def search_organizations(query: str):
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.get("/{organization_id}", tags=["Get Organization Details"])
-async def get_organization_by_id(
+def get_organization_by_id(
     organization_id: int = Path(...),
     session_token: str = Cookie(None, alias="session_token"),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     try:
         # First, check if organization exists at all
         org_exists_stmt = select(table["organization"].c.id).where(
@@ -1207,16 +1187,14 @@ async def get_organization_by_id(
         raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.get("/profile/{account_uuid}", tags=["Get Organization Profile"])
-async def get_organization_profile(
+def get_organization_profile(
     account_uuid: str = Path(..., description="The UUID of the organization's account"),
     session_token: str = Cookie(...),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     try:
         # Validate session token
         session_account_uuid = get_account_uuid_from_session(session_token)
@@ -1505,5 +1483,3 @@ async def get_organization_profile(
         raise HTTPException(status_code=500, detail="Database error: " + str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
\ No newline at end of file
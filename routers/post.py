@@ -9,7 +9,10 @@ from fastapi import (
     Query,
 )
 from pydantic import BaseModel, constr
-from lib.database import Database
+from lib.database import get_db, get_tables
+from fastapi import Depends
+from sqlalchemy.orm import Session
+from fastapi_cache.decorator import cache
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy import insert, select, func
 from typing import Optional
@@ -21,6 +24,7 @@ from utils.session_utils import get_account_uuid_from_session
 from utils.profanity_filter import moderate_text
 from utils.notification_service import NotificationService
 from utils.datetime_utils import format_datetime
+from utils.cache_utils import invalidate_namespace
 import json
 
 
@@ -29,18 +33,19 @@ router = APIRouter(
     tags=["Post"],
 )
 
-db = Database()
-table = db.tables
-# session = db.session
+table = get_tables()
+
+# Namespace of the cached single-post responses, cleared when a post changes
+POSTS_CACHE_NAMESPACE = "posts"
 
 
 @router.post("/", tags=["Create Post"])
-async def create_post(
+def create_post(
     description: str = Form(None),
     session_token: str = Cookie(None, alias="session_token"),
     images: Optional[list[UploadFile]] = File(None),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     notification_service = NotificationService()
 
     try:
@@ -133,16 +138,15 @@ async def create_post(
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        session.close()
         notification_service.close()
 
 
 @router.get("/all", tags=["Get All Posts with Comments"])
-async def get_all_posts(
+def get_all_posts(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Posts per page"),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     try:
         offset = (page - 1) * page_size
         profile_resource = table["resource"].alias("profile_resource")
@@ -395,17 +399,15 @@ async def get_all_posts(
         raise HTTPException(status_code=500, detail="Database error: " + str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.get("/{account_uuid}", tags=["Get Posts of User or Organization"])
-async def get_posts(
+def get_posts(
     account_uuid: str,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(5, ge=1, le=100, description="Posts per page"),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     try:
         # Get account details
         account_stmt = select(table["account"]).where(
@@ -576,12 +578,12 @@ async def get_posts(
 
 
 @router.get("/{account_uuid}/with_comments", tags=["Get Posts With Comments"])
-async def get_posts_with_comments(
+def get_posts_with_comments(
     account_uuid: str,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(5, ge=1, le=100, description="Posts per page"),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     try:
         # Get account_id from uuid
         select_stmt = select(table["account"].c.id).where(
@@ -879,13 +881,13 @@ async def get_posts_with_comments(
 
 
 @router.put("/{post_id}", tags=["Update Post"])
-async def update_post(
+def update_post(
     post_id: int = Path(..., description="The ID of the post to update"),
     description: str = Form(None),
     images: Optional[list[UploadFile]] = File(None),
     session_token: str = Cookie(None, alias="session_token"),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     try:
         if not session_token:
             raise HTTPException(status_code=401, detail="Authentication required")
@@ -978,6 +980,7 @@ async def update_post(
             raise HTTPException(
                 status_code=404, detail="Post not found or not owned by user"
             )
+        invalidate_namespace(POSTS_CACHE_NAMESPACE)
         return {"message": "Post updated successfully"}
     except SQLAlchemyError as e:
         session.rollback()
@@ -985,16 +988,14 @@ async def update_post(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.delete("/{post_id}", tags=["Delete Post"])
-async def delete_post(
+def delete_post(
     post_id: int = Path(..., description="The ID of the post to delete"),
     session_token: str = Cookie(None, alias="session_token"),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     try:
         if not session_token:
             raise HTTPException(status_code=401, detail="Authentication required")
@@ -1041,6 +1042,7 @@ async def delete_post(
             raise HTTPException(
                 status_code=404, detail="Post not found or not owned by user"
             )
+        invalidate_namespace(POSTS_CACHE_NAMESPACE)
         return {"message": "Post deleted successfully"}
     except SQLAlchemyError as e:
         session.rollback()
@@ -1048,15 +1050,14 @@ async def delete_post(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.get("/single/{post_id}", tags=["Get Single Post"])
-async def get_single_post(
+@cache(expire=60, namespace=POSTS_CACHE_NAMESPACE)
+def get_single_post(
     post_id: int = Path(..., description="The ID of the post to fetch"),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     try:
         # Join post with account (author), user/org, and resource (profile picture)
         profile_resource = table["resource"].alias("profile_resource")
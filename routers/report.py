@@ -1,5 +1,7 @@
 from fastapi import APIRouter, HTTPException, Query, Cookie
-from lib.database import Database
+from lib.database import get_db, get_tables
+from fastapi import Depends
+from sqlalchemy.orm import Session
 from sqlalchemy import select, func, and_
 from sqlalchemy.exc import SQLAlchemyError
 from utils.session_utils import get_account_uuid_from_session
@@ -12,23 +14,22 @@ router = APIRouter(
     tags=["Analytics and Reporting"],
 )
 
-db = Database()
-table = db.tables
+table = get_tables()
 
 
 @router.get("/event-respondents", tags=["Event Analytics"])
-async def get_event_respondents_analytics(
+def get_event_respondents_analytics(
     session_token: str = Cookie(None, alias="session_token"),
     event_id: Optional[int] = Query(None, description="Filter by specific event ID"),
     start_date: Optional[datetime] = Query(None, description="Filter RSVPs modified after this date (YYYY-MM-DD HH:MM:SS)"),
     end_date: Optional[datetime] = Query(None, description="Filter RSVPs modified before this date (YYYY-MM-DD HH:MM:SS)"),
+    session: Session = Depends(get_db),
 ):
     """
     Get RSVP analytics for events owned by the organization.
     Returns counts of joined, rejected, and pending responses per event.
     Supports date filtering based on RSVP last_modified_date.
     """
-    session = db.session
     
     # Validate session token
     if not session_token:
@@ -146,21 +147,19 @@ async def get_event_respondents_analytics(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.get("/event-respondents-summary", tags=["Event Analytics"])
-async def get_event_respondents_summary(
+def get_event_respondents_summary(
     session_token: str = Cookie(None, alias="session_token"),
     start_date: Optional[datetime] = Query(None, description="Filter RSVPs modified after this date (YYYY-MM-DD HH:MM:SS)"),
     end_date: Optional[datetime] = Query(None, description="Filter RSVPs modified before this date (YYYY-MM-DD HH:MM:SS)"),
+    session: Session = Depends(get_db),
 ):
     """
     Get aggregated RSVP summary across all events owned by the organization.
     Returns total counts and percentages for joined, rejected, and pending responses.
     """
-    session = db.session
     
     # Validate session token
     if not session_token:
@@ -273,23 +272,21 @@ async def get_event_respondents_summary(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.get("/event-respondents-details", tags=["Event Analytics"])
-async def get_event_respondents_details(
+def get_event_respondents_details(
     event_id: int = Query(..., description="Event ID to get detailed respondent information"),
     session_token: str = Cookie(None, alias="session_token"),
     status_filter: Optional[str] = Query(None, description="Filter by RSVP status: joined, rejected, or pending"),
     start_date: Optional[datetime] = Query(None, description="Filter RSVPs modified after this date (YYYY-MM-DD HH:MM:SS)"),
     end_date: Optional[datetime] = Query(None, description="Filter RSVPs modified before this date (YYYY-MM-DD HH:MM:SS)"),
+    session: Session = Depends(get_db),
 ):
     """
     Get detailed respondent information for a specific event.
     Returns individual RSVP records with user details.
     """
-    session = db.session
     
     # Validate session token
     if not session_token:
@@ -414,23 +411,21 @@ async def get_event_respondents_details(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.get("/membership-analytics", tags=["Membership Analytics"])
-async def get_membership_analytics(
+def get_membership_analytics(
     session_token: str = Cookie(None, alias="session_token"),
     start_date: Optional[datetime] = Query(None, description="Filter memberships modified after this date (YYYY-MM-DD HH:MM:SS)"),
     end_date: Optional[datetime] = Query(None, description="Filter memberships modified before this date (YYYY-MM-DD HH:MM:SS)"),
     status_filter: Optional[str] = Query(None, description="Filter by membership status: pending, approved, rejected, left"),
+    session: Session = Depends(get_db),
 ):
     """
     Get membership analytics for the organization.
     Returns counts of pending, approved, rejected, and left memberships.
     Supports date filtering based on membership last_modified_date.
     """
-    session = db.session
     
     # Validate session token
     if not session_token:
@@ -562,23 +557,21 @@ async def get_membership_analytics(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.get("/membership-details", tags=["Membership Analytics"])
-async def get_membership_details(
+def get_membership_details(
     session_token: str = Cookie(None, alias="session_token"),
     status_filter: Optional[str] = Query(None, description="Filter by membership status: pending, approved, rejected, left"),
     start_date: Optional[datetime] = Query(None, description="Filter memberships modified after this date (YYYY-MM-DD HH:MM:SS)"),
     end_date: Optional[datetime] = Query(None, description="Filter memberships modified before this date (YYYY-MM-DD HH:MM:SS)"),
     limit: Optional[int] = Query(100, description="Maximum number of records to return (default: 100)"),
+    session: Session = Depends(get_db),
 ):
     """
     Get detailed membership information for the organization.
     Returns individual membership records with user details.
     """
-    session = db.session
     
     # Validate session token
     if not session_token:
@@ -700,21 +693,19 @@ async def get_membership_details(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.get("/comment-analytics/posts", tags=["reports"])
-async def get_post_comment_analytics(
+def get_post_comment_analytics(
     session_token: str = Cookie(None, alias="session_token"),
     start_date: Optional[datetime] = Query(None, description="Start date for filtering (YYYY-MM-DD HH:MM:SS)"),
-    end_date: Optional[datetime] = Query(None, description="End date for filtering (YYYY-MM-DD HH:MM:SS)")
+    end_date: Optional[datetime] = Query(None, description="End date for filtering (YYYY-MM-DD HH:MM:SS)"),
+    session: Session = Depends(get_db),
 ):
     """
     Get comment analytics for all posts owned by the organization.
     Returns the total number of comments on organization's posts with date filtering using comment created_date.
     """
-    session = db.session
     
     # Validate session token
     if not session_token:
@@ -819,21 +810,19 @@ async def get_post_comment_analytics(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.get("/comment-analytics/events", tags=["reports"])
-async def get_event_comment_analytics(
+def get_event_comment_analytics(
     session_token: str = Cookie(None, alias="session_token"),
     start_date: Optional[datetime] = Query(None, description="Start date for filtering (YYYY-MM-DD HH:MM:SS)"),
-    end_date: Optional[datetime] = Query(None, description="End date for filtering (YYYY-MM-DD HH:MM:SS)")
+    end_date: Optional[datetime] = Query(None, description="End date for filtering (YYYY-MM-DD HH:MM:SS)"),
+    session: Session = Depends(get_db),
 ):
     """
     Get comment analytics for all events owned by the organization.
     Returns the total number of comments on organization's events with date filtering using comment created_date.
     """
-    session = db.session
     
     # Validate session token
     if not session_token:
@@ -940,21 +929,19 @@ async def get_event_comment_analytics(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.get("/comment-analytics/summary", tags=["reports"])
-async def get_comment_analytics_summary(
+def get_comment_analytics_summary(
     session_token: str = Cookie(None, alias="session_token"),
     start_date: Optional[datetime] = Query(None, description="Start date for filtering (YYYY-MM-DD HH:MM:SS)"),
-    end_date: Optional[datetime] = Query(None, description="End date for filtering (YYYY-MM-DD HH:MM:SS)")
+    end_date: Optional[datetime] = Query(None, description="End date for filtering (YYYY-MM-DD HH:MM:SS)"),
+    session: Session = Depends(get_db),
 ):
     """
     Get a comprehensive summary of comment analytics for both posts and events owned by the organization.
     Returns aggregated statistics with date filtering using comment created_date.
     """
-    session = db.session
     
     # Validate session token
     if not session_token:
@@ -1196,5 +1183,3 @@ async def get_comment_analytics_summary(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
@@ -10,7 +10,7 @@ router = APIRouter(
 
 
 @router.post("/upload", tags=["Upload photo"])
-async def upload_photo(
+def upload_photo(
     file: UploadFile = File(...),
     uploader_uuid: str = File(..., description="Uploader UUID"),
 ):
@@ -35,7 +35,7 @@ async def upload_photo(
 
 
 @router.delete("/{resource_id}", tags=["Delete photo"])
-async def delete_photo(
+def delete_photo(
     resource_id: int = Path(..., description="The ID of the resource to delete"),
     uploader_uuid: str = Query(..., description="Uploader UUID"),
 ):
@@ -56,7 +56,7 @@ async def delete_photo(
 
 
 @router.get("/{resource_id}", tags=["Get photo by ID"])
-async def get_photo(
+def get_photo(
     resource_id: int = Path(..., description="The ID of the resource to retrieve"),
 ):
     try:
@@ -73,7 +73,7 @@ async def get_photo(
 
 
 @router.get("/info/{resource_id}", tags=["Get photo information by ID"])
-async def get_photo(
+def get_photo(
     resource_id: int = Path(..., description="The ID of the resource to retrieve"),
 ):
     try:
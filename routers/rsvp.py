@@ -1,5 +1,7 @@
 from fastapi import APIRouter, HTTPException, Form
-from lib.database import Database
+from lib.database import get_db, get_tables
+from fastapi import Depends
+from sqlalchemy.orm import Session
 from sqlalchemy import insert, update, delete
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from fastapi import Request
@@ -13,15 +15,14 @@ router = APIRouter(
     tags=["RSVP Management"],
 )
 
-db = Database()
-table = db.tables
-session = db.session
+table = get_tables()
 
 
 @router.post("/", tags=["Create RSVP"])
-async def create_rsvp(
+def create_rsvp(
     event_id: int = Form(...),
     request: Request = None,
+    session: Session = Depends(get_db),
 ):
     notification_service = NotificationService()
     
@@ -87,8 +88,9 @@ async def create_rsvp(
 
 
 @router.get("/event/{event_id}", tags=["Get RSVPs for Event"])
-async def get_rsvps_for_event(
+def get_rsvps_for_event(
     event_id: int,
+    session: Session = Depends(get_db),
 ):
     try:
         # Fetch all RSVP records for the given event_id, joining account, user, and resource tables
@@ -158,13 +160,12 @@ async def get_rsvps_for_event(
         raise HTTPException(status_code=500, detail="Database error: " + str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.get("/attendees/{event_id}", tags=["Get Attendees of an Event"])
-async def get_attendees_for_event(
+def get_attendees_for_event(
     event_id: int,
+    session: Session = Depends(get_db),
 ):
     try:
         # Fetch all RSVP records for the given event_id
@@ -225,17 +226,15 @@ async def get_attendees_for_event(
         raise HTTPException(status_code=500, detail="Database error: " + str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.put("/status/{rsvp_id}", tags=["Update RSVP Status"])
-async def update_rsvp_status(
+def update_rsvp_status(
     rsvp_id: int,
     request: Request = None,
     status: str = Form(...),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     notification_service = NotificationService()
     
     try:
@@ -305,14 +304,14 @@ async def update_rsvp_status(
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        session.close()
         notification_service.close()
 
 
 @router.delete("/{rsvp_id}", tags=["Delete RSVP"])
-async def delete_rsvp(
+def delete_rsvp(
     rsvp_id: int,
     request: Request = None,
+    session: Session = Depends(get_db),
 ):
     try:
         # Get session_token from cookie
@@ -363,14 +362,13 @@ async def delete_rsvp(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.post("/statuses", tags=["Get RSVP Statuses for Accounts"])
-async def get_rsvp_statuses_for_accounts(
+def get_rsvp_statuses_for_accounts(
     event_id: int = Form(...),
     account_uuids: list[str] = Form(...),
+    session: Session = Depends(get_db),
 ):
     try:
         # Get account IDs from UUIDs
@@ -413,5 +411,3 @@ async def get_rsvp_statuses_for_accounts(
         raise HTTPException(status_code=500, detail="Database error: " + str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
\ No newline at end of file
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException, Form, Cookie, Query
 from fastapi.responses import JSONResponse
-from lib.database import Database
+from lib.database import get_db, get_tables
+from fastapi import Depends
+from sqlalchemy.orm import Session
 from sqlalchemy import insert, delete, select, func
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from utils.session_utils import get_account_uuid_from_session
@@ -12,20 +14,18 @@ router = APIRouter(
     prefix="/share",
     tags=["Shares Management"],
 )
-db = Database()
-table = db.tables
-# session = db.session
+table = get_tables()
 
 @router.post("/", tags=["Share Content"])
-async def share_content(
+def share_content(
     content_id: int = Form(..., description="ID of the content to share (post or event)"),
     content_type: int = Form(..., description="Content type: 1 for post, 2 for event"),
     comment: Optional[str] = Form(None, description="Optional comment when sharing"),
     session_token: str = Cookie(None, alias="session_token"),
+    session: Session = Depends(get_db),
 ):
     try:
 
-        session = db.session
 
         if not session_token:
             raise HTTPException(status_code=401, detail="Authentication required")
@@ -88,18 +88,16 @@ async def share_content(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.delete("/{share_id}", tags=["Delete Share"])
-async def delete_share(
+def delete_share(
     share_id: int,
     session_token: str = Cookie(None, alias="session_token"),
+    session: Session = Depends(get_db),
 ):
     try:
 
-        session = db.session
 
         if not session_token:
             raise HTTPException(status_code=401, detail="Authentication required")
@@ -134,23 +132,21 @@ async def delete_share(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.get("/user", tags=["Get User Shares"])
-async def get_user_shares(
+def get_user_shares(
     account_uuid: str,
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=50, description="Items per page"),
     content_type: Optional[int] = Query(None, description="Filter by content type: 1 for posts, 2 for events"),
     
     # session_token: str = Cookie(None, alias="session_token"),
+    session: Session = Depends(get_db),
 ):
 
     try:
 
-        session = db.session
 
         # if not session_token:
         #     raise HTTPException(status_code=401, detail="Authentication required")
@@ -475,20 +471,18 @@ async def get_user_shares(
         raise HTTPException(status_code=500, detail="Database error: " + str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.get("/content/{content_type}/{content_id}", tags=["Get Shares for Content"])
-async def get_shares_for_content(
+def get_shares_for_content(
     content_type: int,
     content_id: int,
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=50, description="Items per page"),
+    session: Session = Depends(get_db),
 ):
     try:
 
-        session = db.session
 
         # Validate content_type
         if content_type not in [1, 2]:
@@ -610,20 +604,18 @@ async def get_shares_for_content(
         raise HTTPException(status_code=500, detail="Database error: " + str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 @router.get("/all_with_comments", tags=["Get All Shares With Comments"])
-async def get_all_shares_with_comments(
+def get_all_shares_with_comments(
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=50, description="Items per page"),
     content_type: Optional[int] = Query(None, description="Filter by content type: 1 for posts, 2 for events"),
     session_token: str = Cookie(None, alias="session_token"),
+    session: Session = Depends(get_db),
 ):
     """
     Get all shared content (posts and events) with comments for news feed
     """
-    session = db.session
     try:
         offset = (page - 1) * limit
         user_id = None
@@ -966,5 +958,3 @@ async def get_all_shares_with_comments(
         raise HTTPException(status_code=500, detail="Database error: " + str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
\ No newline at end of file
@@ -2,11 +2,14 @@
 2FA (Two-Factor Authentication) management endpoints
 """
 from fastapi import APIRouter, HTTPException, Form, Cookie
-from lib.database import Database
-from sqlalchemy import select, update
+from lib.database import get_db, get_tables
+from fastapi import Depends
+from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, select, update
 from sqlalchemy.exc import SQLAlchemyError
 from utils.session_utils import get_account_uuid_from_session
 from utils.two_factor_auth import TwoFactorAuth
+from utils.cache_utils import invalidate_profile
 import json
 
 router = APIRouter(
@@ -14,17 +17,31 @@ router = APIRouter(
     tags=["Two-Factor Authentication"],
 )
 
-db = Database()
-table = db.tables
+table = get_tables()
+
+ACCOUNT_TBL = table["account"]
+
+# Statements built once at import; every handler works on the signed-in
+# account, so they all key on its uuid
+ACCOUNT_2FA_BY_UUID_STMT = select(
+    ACCOUNT_TBL.c.email,
+    ACCOUNT_TBL.c.totp_secret,
+    ACCOUNT_TBL.c.backup_codes,
+    ACCOUNT_TBL.c.two_factor_enabled,
+    ACCOUNT_TBL.c.bypass_two_factor,
+).where(ACCOUNT_TBL.c.uuid == bindparam("account_uuid"))
+UPDATE_ACCOUNT_BY_UUID_STMT = update(ACCOUNT_TBL).where(
+    ACCOUNT_TBL.c.uuid == bindparam("account_uuid")
+)
 
 @router.post("/setup", tags=["Setup 2FA"])
-async def setup_2fa(
+def setup_2fa(
     session_token: str = Cookie(None, alias="session_token"),
+    session: Session = Depends(get_db),
 ):
     """
     Generate TOTP secret and QR code for 2FA setup
     """
-    session = db.session
     
     # Validate session token
     if not session_token:
@@ -37,15 +54,14 @@ async def setup_2fa(
     
     try:
         # Get account details
-        account_stmt = select(table["account"]).where(table["account"].c.uuid == account_uuid)
-        account_result = session.execute(account_stmt).first()
-        if not account_result:
+        account = session.execute(
+            ACCOUNT_2FA_BY_UUID_STMT, {"account_uuid": account_uuid}
+        ).first()
+        if not account:
             raise HTTPException(status_code=404, detail="Account not found")
         
-        account = account_result._mapping
-        
         # Check if 2FA is already enabled
-        if account["two_factor_enabled"]:
+        if account.two_factor_enabled:
             raise HTTPException(status_code=400, detail="2FA is already enabled for this account")
         
         # Generate new TOTP secret
@@ -53,7 +69,7 @@ async def setup_2fa(
         
         # Generate QR code
         qr_code_base64 = TwoFactorAuth.generate_qr_code(
-            email=account["email"],
+            email=account.email,
             secret=secret,
             issuer_name="OpenCircle"
         )
@@ -63,15 +79,11 @@ async def setup_2fa(
         backup_codes_json = TwoFactorAuth.format_backup_codes(backup_codes)
         
         # Store the secret temporarily (not enabled yet)
-        update_stmt = (
-            update(table["account"])
-            .where(table["account"].c.uuid == account_uuid)
-            .values(
-                totp_secret=secret,
-                backup_codes=backup_codes_json
-            )
+        update_stmt = UPDATE_ACCOUNT_BY_UUID_STMT.values(
+            totp_secret=secret,
+            backup_codes=backup_codes_json
         )
-        session.execute(update_stmt)
+        session.execute(update_stmt, {"account_uuid": account_uuid})
         session.commit()
         
         return {
@@ -87,19 +99,17 @@ async def setup_2fa(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.post("/enable", tags=["Enable 2FA"])
-async def enable_2fa(
+def enable_2fa(
     totp_token: str = Form(..., description="6-digit TOTP token from authenticator app"),
     session_token: str = Cookie(None, alias="session_token"),
+    session: Session = Depends(get_db),
 ):
     """
     Enable 2FA by verifying TOTP token
     """
-    session = db.session
     
     # Validate session token
     if not session_token:
@@ -112,33 +122,28 @@ async def enable_2fa(
     
     try:
         # Get account details
-        account_stmt = select(table["account"]).where(table["account"].c.uuid == account_uuid)
-        account_result = session.execute(account_stmt).first()
-        if not account_result:
+        account = session.execute(
+            ACCOUNT_2FA_BY_UUID_STMT, {"account_uuid": account_uuid}
+        ).first()
+        if not account:
             raise HTTPException(status_code=404, detail="Account not found")
         
-        account = account_result._mapping
-        
         # Check if TOTP secret exists
-        if not account["totp_secret"]:
+        if not account.totp_secret:
             raise HTTPException(status_code=400, detail="2FA setup not initiated. Please call /2fa/setup first.")
         
         # Verify TOTP token
-        if not TwoFactorAuth.verify_totp(account["totp_secret"], totp_token):
+        if not TwoFactorAuth.verify_totp(account.totp_secret, totp_token):
             raise HTTPException(status_code=400, detail="Invalid TOTP token")
         
         # Enable 2FA
-        update_stmt = (
-            update(table["account"])
-            .where(table["account"].c.uuid == account_uuid)
-            .values(two_factor_enabled=True)
-        )
-        session.execute(update_stmt)
+        update_stmt = UPDATE_ACCOUNT_BY_UUID_STMT.values(two_factor_enabled=True)
+        session.execute(update_stmt, {"account_uuid": account_uuid})
         session.commit()
         
         return {
             "message": "2FA has been successfully enabled for your account",
-            "backup_codes": TwoFactorAuth.get_backup_codes_list(account["backup_codes"])
+            "backup_codes": TwoFactorAuth.get_backup_codes_list(account.backup_codes)
         }
         
     except SQLAlchemyError as e:
@@ -147,19 +152,17 @@ async def enable_2fa(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.post("/disable", tags=["Disable 2FA"])
-async def disable_2fa(
+def disable_2fa(
     totp_token: str = Form(..., description="6-digit TOTP token or backup code"),
     session_token: str = Cookie(None, alias="session_token"),
+    session: Session = Depends(get_db),
 ):
     """
     Disable 2FA by verifying TOTP token or backup code
     """
-    session = db.session
     
     # Validate session token
     if not session_token:
@@ -172,40 +175,35 @@ async def disable_2fa(
     
     try:
         # Get account details
-        account_stmt = select(table["account"]).where(table["account"].c.uuid == account_uuid)
-        account_result = session.execute(account_stmt).first()
-        if not account_result:
+        account = session.execute(
+            ACCOUNT_2FA_BY_UUID_STMT, {"account_uuid": account_uuid}
+        ).first()
+        if not account:
             raise HTTPException(status_code=404, detail="Account not found")
         
-        account = account_result._mapping
-        
         # # Check if 2FA is enabled
-        # if not account["two_factor_enabled"]:
+        # if not account.two_factor_enabled:
         #     raise HTTPException(status_code=400, detail="2FA is not enabled for this account")
         
         # Try TOTP first, then backup code
         is_valid = False
-        updated_backup_codes = account["backup_codes"]
+        updated_backup_codes = account.backup_codes
         
         if len(totp_token) == 6 and totp_token.isdigit():
             # Verify TOTP token
-            is_valid = TwoFactorAuth.verify_totp(account["totp_secret"], totp_token)
+            is_valid = TwoFactorAuth.verify_totp(account.totp_secret, totp_token)
         else:
             # Try backup code
             is_valid, updated_backup_codes = TwoFactorAuth.verify_backup_code(
-                account["backup_codes"], totp_token
+                account.backup_codes, totp_token
             )
         
         if not is_valid:
             raise HTTPException(status_code=400, detail="Invalid TOTP token or backup code")
         
         # Disable 2FA (keep secrets for re-enabling)
-        update_stmt = (
-            update(table["account"])
-            .where(table["account"].c.uuid == account_uuid)
-            .values(two_factor_enabled=False)
-        )
-        session.execute(update_stmt)
+        update_stmt = UPDATE_ACCOUNT_BY_UUID_STMT.values(two_factor_enabled=False)
+        session.execute(update_stmt, {"account_uuid": account_uuid})
         session.commit()
         
         return {"message": "2FA has been successfully disabled for your account"}
@@ -216,18 +214,16 @@ async def disable_2fa(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.get("/status", tags=["Get 2FA Status"])
-async def get_2fa_status(
+def get_2fa_status(
     session_token: str = Cookie(None, alias="session_token"),
+    session: Session = Depends(get_db),
 ):
     """
     Get 2FA status for current account
     """
-    session = db.session
     
     # Validate session token
     if not session_token:
@@ -240,35 +236,32 @@ async def get_2fa_status(
     
     try:
         # Get account details
-        account_stmt = select(table["account"]).where(table["account"].c.uuid == account_uuid)
-        account_result = session.execute(account_stmt).first()
-        if not account_result:
+        account = session.execute(
+            ACCOUNT_2FA_BY_UUID_STMT, {"account_uuid": account_uuid}
+        ).first()
+        if not account:
             raise HTTPException(status_code=404, detail="Account not found")
         
-        account = account_result._mapping
-        
         return {
-            "two_factor_enabled": bool(account["two_factor_enabled"]),
-            "backup_codes_count": len(TwoFactorAuth.get_backup_codes_list(account["backup_codes"])) if account["backup_codes"] else 0
+            "two_factor_enabled": bool(account.two_factor_enabled),
+            "backup_codes_count": len(TwoFactorAuth.get_backup_codes_list(account.backup_codes)) if account.backup_codes else 0
         }
         
     except SQLAlchemyError as e:
         raise HTTPException(status_code=500, detail="Database error: " + str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.post("/bypass-two-factor", tags=["Bypass Two-Factor"])
-async def bypass_two_factor(
+def bypass_two_factor(
     bypass_status: bool = Form(..., description="Set bypass two-factor status (true to bypass, false to require 2FA)"),
     session_token: str = Cookie(None, alias="session_token"),
+    session: Session = Depends(get_db),
 ):
     """
     Set bypass two-factor authentication status for the account
     """
-    session = db.session
     
     # Validate session token
     if not session_token:
@@ -281,19 +274,18 @@ async def bypass_two_factor(
     
     try:
         # Get account details
-        account_stmt = select(table["account"]).where(table["account"].c.uuid == account_uuid)
-        account_result = session.execute(account_stmt).first()
-        if not account_result:
+        account = session.execute(
+            ACCOUNT_2FA_BY_UUID_STMT, {"account_uuid": account_uuid}
+        ).first()
+        if not account:
             raise HTTPException(status_code=404, detail="Account not found")
         
         # Update bypass two-factor status
-        update_stmt = (
-            update(table["account"])
-            .where(table["account"].c.uuid == account_uuid)
-            .values(bypass_two_factor=bypass_status)
-        )
-        session.execute(update_stmt)
+        update_stmt = UPDATE_ACCOUNT_BY_UUID_STMT.values(bypass_two_factor=bypass_status)
+        session.execute(update_stmt, {"account_uuid": account_uuid})
         session.commit()
+        # /account/auth_user reports bypass_two_factor
+        invalidate_profile(account_uuid)
         
         status_message = "enabled" if bypass_status else "disabled"
         return {
@@ -307,18 +299,16 @@ async def bypass_two_factor(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.get("/is-two-factor-bypassed", tags=["Check Two-Factor Bypass"])
-async def is_two_factor_bypassed(
+def is_two_factor_bypassed(
     session_token: str = Cookie(None, alias="session_token"),
+    session: Session = Depends(get_db),
 ):
     """
     Check if two-factor authentication is bypassed for the current account
     """
-    session = db.session
     
     # Validate session token
     if not session_token:
@@ -331,36 +321,33 @@ async def is_two_factor_bypassed(
     
     try:
         # Get account details
-        account_stmt = select(table["account"]).where(table["account"].c.uuid == account_uuid)
-        account_result = session.execute(account_stmt).first()
-        if not account_result:
+        account = session.execute(
+            ACCOUNT_2FA_BY_UUID_STMT, {"account_uuid": account_uuid}
+        ).first()
+        if not account:
             raise HTTPException(status_code=404, detail="Account not found")
         
-        account = account_result._mapping
-        
         return {
-            "bypass_two_factor": bool(account["bypass_two_factor"]),
-            "two_factor_enabled": bool(account["two_factor_enabled"]),
-            "effective_2fa_required": bool(account["two_factor_enabled"]) and not bool(account["bypass_two_factor"])
+            "bypass_two_factor": bool(account.bypass_two_factor),
+            "two_factor_enabled": bool(account.two_factor_enabled),
+            "effective_2fa_required": bool(account.two_factor_enabled) and not bool(account.bypass_two_factor)
         }
         
     except SQLAlchemyError as e:
         raise HTTPException(status_code=500, detail="Database error: " + str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.post("/regenerate-backup-codes", tags=["Regenerate Backup Codes"])
-async def regenerate_backup_codes(
+def regenerate_backup_codes(
     totp_token: str = Form(..., description="6-digit TOTP token from authenticator app"),
     session_token: str = Cookie(None, alias="session_token"),
+    session: Session = Depends(get_db),
 ):
     """
     Regenerate backup codes (requires TOTP verification)
     """
-    session = db.session
     
     # Validate session token
     if not session_token:
@@ -373,19 +360,18 @@ async def regenerate_backup_codes(
     
     try:
         # Get account details
-        account_stmt = select(table["account"]).where(table["account"].c.uuid == account_uuid)
-        account_result = session.execute(account_stmt).first()
-        if not account_result:
+        account = session.execute(
+            ACCOUNT_2FA_BY_UUID_STMT, {"account_uuid": account_uuid}
+        ).first()
+        if not account:
             raise HTTPException(status_code=404, detail="Account not found")
         
-        account = account_result._mapping
-        
         # Check if 2FA is enabled
-        if not account["two_factor_enabled"]:
+        if not account.two_factor_enabled:
             raise HTTPException(status_code=400, detail="2FA is not enabled for this account")
         
         # Verify TOTP token
-        if not TwoFactorAuth.verify_totp(account["totp_secret"], totp_token):
+        if not TwoFactorAuth.verify_totp(account.totp_secret, totp_token):
             raise HTTPException(status_code=400, detail="Invalid TOTP token")
         
         # Generate new backup codes
@@ -393,12 +379,8 @@ async def regenerate_backup_codes(
         backup_codes_json = TwoFactorAuth.format_backup_codes(backup_codes)
         
         # Update backup codes
-        update_stmt = (
-            update(table["account"])
-            .where(table["account"].c.uuid == account_uuid)
-            .values(backup_codes=backup_codes_json)
-        )
-        session.execute(update_stmt)
+        update_stmt = UPDATE_ACCOUNT_BY_UUID_STMT.values(backup_codes=backup_codes_json)
+        session.execute(update_stmt, {"account_uuid": account_uuid})
         session.commit()
         
         return {
@@ -412,7 +394,5 @@ async def regenerate_backup_codes(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
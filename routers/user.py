@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException, Path, Cookie
 from pydantic import BaseModel
-from lib.database import Database
+from lib.database import get_db, get_tables
+from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy import insert, select, func
 from typing import Optional
@@ -17,9 +18,7 @@ router = APIRouter(
     tags=["user"],
 )
 
-db = Database()
-table = db.tables
-session = db.session
+table = get_tables()
 
 
 class UserCreate(BaseModel):
@@ -31,7 +30,7 @@ class UserCreate(BaseModel):
 
 
 @router.post("/", tags=["Create user"])
-async def create_user(user: UserCreate):
+def create_user(user: UserCreate, session: Session = Depends(get_db)):
 
     stmt = insert(table["user"]).values(
         account_id=user.account_id,
@@ -52,13 +51,12 @@ async def create_user(user: UserCreate):
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.delete("/{user_id}", tags=["Delete user"])
-async def delete_user(
-    user_id: int = Path(..., description="The ID of the user to delete")
+def delete_user(
+    user_id: int = Path(..., description="The ID of the user to delete"),
+    session: Session = Depends(get_db),
 ):
     stmt = table["user"].delete().where(table["user"].c.id == user_id)
     try:
@@ -70,16 +68,14 @@ async def delete_user(
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
 
 
 @router.get("/profile/{account_uuid}", tags=["Get User Profile"])
-async def get_user_profile(
+def get_user_profile(
     account_uuid: str = Path(..., description="The UUID of the user account"),
     session_token: str = Cookie(...),
+    session: Session = Depends(get_db),
 ):
-    session = db.session
     try:
         # Validate session token
         session_account_uuid = get_account_uuid_from_session(session_token)
@@ -383,5 +379,3 @@ async def get_user_profile(
         raise HTTPException(status_code=500, detail="Database error: " + str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
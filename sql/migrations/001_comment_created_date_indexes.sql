@@ -0,0 +1,14 @@
+-- Widen the comment parent indexes to (event_id|post_id, created_date) so the
+-- comment listings can read a page in index order, matching sql/schema.sql.
+--
+-- Each index also backs its foreign key, so the old index is dropped and the
+-- new one added under the same name in a single ALTER; MySQL/MariaDB accept
+-- that because the new index still starts with the FK column. The build runs
+-- online; if the server can't do it without locking, the ALTER fails rather
+-- than blocking writes to comment.
+ALTER TABLE `comment`
+  DROP INDEX `comments_event_FK`,
+  ADD KEY `comments_event_FK` (`event_id`,`created_date`),
+  DROP INDEX `comments_post_FK`,
+  ADD KEY `comments_post_FK` (`post_id`,`created_date`),
+  ALGORITHM=INPLACE, LOCK=NONE;
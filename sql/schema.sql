@@ -177,8 +177,8 @@ CREATE TABLE `comment` (
   `last_modified_date` datetime NOT NULL DEFAULT current_timestamp() ON UPDATE current_timestamp(),
   PRIMARY KEY (`id`),
   KEY `comments_account_FK` (`author`),
-  KEY `comments_event_FK` (`event_id`),
-  KEY `comments_post_FK` (`post_id`),
+  KEY `comments_event_FK` (`event_id`,`created_date`),
+  KEY `comments_post_FK` (`post_id`,`created_date`),
   CONSTRAINT `comments_account_FK` FOREIGN KEY (`author`) REFERENCES `account` (`id`) ON DELETE CASCADE,
   CONSTRAINT `comments_event_FK` FOREIGN KEY (`event_id`) REFERENCES `event` (`id`) ON DELETE CASCADE,
   CONSTRAINT `comments_post_FK` FOREIGN KEY (`post_id`) REFERENCES `post` (`id`) ON DELETE CASCADE
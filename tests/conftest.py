@@ -0,0 +1,133 @@
+"""
+Integration test fixtures.
+
+The routers reflect their tables from MySQL at import, so these tests run
+against a real database loaded with sql/schema.sql, configured through the
+same DB_* variables as the app. Without DB_HOST they are not collected.
+"""
+
+import os
+import secrets
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+if not os.getenv("DB_HOST"):
+    collect_ignore_glob = ["test_*.py"]
+
+ROLES = {1: "user", 2: "organization"}
+
+
+def utc_now() -> datetime:
+    # DATETIME columns hold naive UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@pytest.fixture(scope="session")
+def app():
+    from main import app
+
+    return app
+
+
+@pytest.fixture
+def client(app):
+    from fastapi.testclient import TestClient
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def engine():
+    from lib.database import get_engine
+
+    return get_engine()
+
+
+@pytest.fixture(scope="session")
+def tables():
+    from lib.database import get_tables
+
+    return get_tables()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def roles(engine, tables):
+    from sqlalchemy import insert, select
+
+    role_tbl = tables["role"]
+    with engine.begin() as connection:
+        existing = set(connection.execute(select(role_tbl.c.id)).scalars())
+        for role_id, name in ROLES.items():
+            if role_id not in existing:
+                connection.execute(insert(role_tbl).values(id=role_id, name=name))
+
+
+@pytest.fixture
+def make_account(engine, tables):
+    """
+    Factory for user accounts with a profile row; extra keyword arguments are
+    written to the account row. Accounts are deleted after the test, which
+    cascades to their profile, sessions, posts and comments.
+    """
+    from sqlalchemy import delete, insert
+
+    from utils.id_utils import uuid7_hex
+
+    account_tbl = tables["account"]
+    created = []
+
+    def _make_account(**columns):
+        suffix = secrets.token_hex(6)
+        values = {
+            "uuid": uuid7_hex(),
+            "email": f"test-{suffix}@example.com",
+            "username": f"test_{suffix}",
+            # Never signed in with; the tests use the session fixture instead
+            "password": "unused",
+            "role_id": 1,
+            "email_verified": True,
+            **columns,
+        }
+        with engine.begin() as connection:
+            result = connection.execute(insert(account_tbl).values(**values))
+            account_id = result.inserted_primary_key[0]
+            connection.execute(
+                insert(tables["user"]).values(
+                    account_id=account_id, first_name="Test", last_name="User"
+                )
+            )
+        created.append(account_id)
+        return SimpleNamespace(id=account_id, **values)
+
+    yield _make_account
+
+    with engine.begin() as connection:
+        for account_id in created:
+            connection.execute(delete(account_tbl).where(account_tbl.c.id == account_id))
+
+
+@pytest.fixture
+def sign_in(engine, tables, client):
+    """Create a session row for an account and send its cookie with the client."""
+    from sqlalchemy import insert
+
+    def _sign_in(account):
+        session_token = secrets.token_urlsafe(32)
+        now = utc_now()
+        with engine.begin() as connection:
+            connection.execute(
+                insert(tables["session"]).values(
+                    account_uuid=account.uuid,
+                    session_token=session_token,
+                    created_at=now,
+                    expires_at=now + timedelta(hours=1),
+                    last_activity=now,
+                )
+            )
+        client.cookies.set("session_token", session_token)
+        return session_token
+
+    return _sign_in
@@ -0,0 +1,46 @@
+from datetime import timedelta
+
+from sqlalchemy import select
+
+from conftest import utc_now
+
+
+def _otp_state(engine, tables, account_id):
+    account_tbl = tables["account"]
+    with engine.connect() as connection:
+        return connection.execute(
+            select(
+                account_tbl.c.email_verified,
+                account_tbl.c.email_otp_code,
+                account_tbl.c.otp_attempts,
+            ).where(account_tbl.c.id == account_id)
+        ).one()
+
+
+def test_verify_email_otp_counts_failure_then_activates(
+    client, engine, tables, make_account
+):
+    account = make_account(
+        email_verified=False,
+        email_otp_code="123456",
+        email_otp_expires=utc_now() + timedelta(minutes=10),
+        otp_attempts=0,
+    )
+
+    response = client.post(
+        "/account/verify-email-otp",
+        data={"email": account.email, "otp_code": "654321"},
+    )
+    assert response.status_code == 400
+    assert _otp_state(engine, tables, account.id).otp_attempts == 1
+
+    response = client.post(
+        "/account/verify-email-otp",
+        data={"email": account.email, "otp_code": "123456"},
+    )
+    assert response.status_code == 200
+    assert response.json()["email_verified"] is True
+    state = _otp_state(engine, tables, account.id)
+    assert state.email_verified
+    assert state.email_otp_code is None
+    assert state.otp_attempts == 0
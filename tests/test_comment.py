@@ -0,0 +1,29 @@
+from sqlalchemy import insert
+
+
+def test_new_comment_appears_in_cached_listing(
+    client, engine, tables, make_account, sign_in
+):
+    account = make_account()
+    with engine.begin() as connection:
+        post_id = connection.execute(
+            insert(tables["post"]).values(author=account.id, description="Test post")
+        ).inserted_primary_key[0]
+
+    response = client.get(f"/comment/post/{post_id}")
+    assert response.status_code == 200
+    assert response.json()["comments"] == []
+    assert response.headers["cache-control"] == "no-cache"
+
+    sign_in(account)
+    response = client.post(
+        "/comment/post", data={"post_id": post_id, "message": "First comment"}
+    )
+    assert response.status_code == 200
+
+    # The first listing is still cached; the write must have cleared it
+    response = client.get(f"/comment/post/{post_id}")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 1
+    assert [comment["message"] for comment in body["comments"]] == ["First comment"]
@@ -1,11 +1,9 @@
-from lib.database import Database
+from lib.database import SessionLocal, get_tables
 from sqlalchemy import insert
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy import update
 
-db = Database()
-table = db.tables
-session = db.session
+table = get_tables()
 
 
 def add_address(
@@ -30,6 +28,7 @@ def add_address(
         city_code=city_code,
         barangay_code=barangay_code,
     )
+    session = SessionLocal()
     try:
         result = session.execute(stmt)
         session.commit()
@@ -84,6 +83,7 @@ def update_address(
         .where(table["address"].c.id == address_id)
         .values(**update_values)
     )
+    session = SessionLocal()
     try:
         result = session.execute(stmt)
         session.commit()
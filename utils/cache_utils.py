@@ -0,0 +1,166 @@
+"""Response caching utilities built on fastapi-cache2."""
+
+import hashlib
+import logging
+import os
+import threading
+from typing import Optional
+
+import anyio.from_thread
+import orjson
+from cachetools import TTLCache
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+
+CACHE_PREFIX = "oc"
+
+logger = logging.getLogger(__name__)
+
+# Injected per-request objects that must never become part of a cache key
+_EXCLUDED_KEY_ARGS = ("session", "request", "response")
+
+# /account/auth_user payloads keyed by account uuid, held as encoded JSON so
+# a hit skips the queries and the response encoding. The session token is
+# still validated on every request. Per-process, so the TTL bounds staleness
+# across workers.
+PROFILE_CACHE_TTL_SECONDS = int(os.getenv("PROFILE_CACHE_TTL_SECONDS", "60"))
+_profile_cache = TTLCache(maxsize=10000, ttl=PROFILE_CACHE_TTL_SECONDS)
+_profile_cache_lock = threading.Lock()
+
+
+def request_key_builder(
+    func,
+    namespace: str = "",
+    *,
+    request=None,
+    response=None,
+    args=(),
+    kwargs=None,
+):
+    """
+    Build a cache key from the endpoint and its query/path parameters only.
+    fastapi-cache passes the namespace already prefixed ("oc:comments"), which
+    is also what FastAPICache.clear() matches on, so it is used as is.
+    """
+    params = {
+        name: value
+        for name, value in (kwargs or {}).items()
+        if name not in _EXCLUDED_KEY_ARGS
+    }
+    raw_key = f"{func.__module__}:{func.__name__}:{args}:{sorted(params.items())}"
+    digest = hashlib.md5(raw_key.encode()).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+def _redis_backend(redis_url: str):
+    from redis import asyncio as aioredis
+    from fastapi_cache.backends.redis import RedisBackend
+
+    class ScanRedisBackend(RedisBackend):
+        # RedisBackend.clear() finds a namespace's keys with KEYS, which
+        # blocks Redis for a walk of the whole keyspace; SCAN does the same
+        # walk in small steps between other commands
+        async def clear(self, namespace: Optional[str] = None, key: Optional[str] = None) -> int:
+            if not namespace:
+                return await super().clear(namespace, key)
+            deleted = 0
+            batch = []
+            async for cache_key in self.redis.scan_iter(match=f"{namespace}:*", count=500):
+                batch.append(cache_key)
+                if len(batch) == 500:
+                    deleted += await self.redis.unlink(*batch)
+                    batch = []
+            if batch:
+                deleted += await self.redis.unlink(*batch)
+            return deleted
+
+    return ScanRedisBackend(aioredis.from_url(redis_url))
+
+
+def init_cache():
+    """
+    Use Redis when REDIS_URL is set, otherwise fall back to a per-process
+    cache. Invalidation only reaches the process it runs in, so with more
+    than one worker the in-memory backend serves stale entries from the
+    other workers until their TTL expires.
+    """
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        backend = _redis_backend(redis_url)
+    else:
+        if int(os.getenv("WEB_CONCURRENCY", "1")) > 1:
+            logger.warning(
+                "REDIS_URL is not set with multiple workers; cache invalidation "
+                "will not reach other workers until their entries expire"
+            )
+        backend = InMemoryBackend()
+
+    FastAPICache.init(backend, prefix=CACHE_PREFIX, key_builder=request_key_builder)
+
+
+def invalidate_namespace(namespace: str):
+    """
+    Drop every cached response in a namespace. Called from sync handlers,
+    which run on threadpool threads, so the async clear is run on the event
+    loop. A cache failure is logged rather than failing the write. Without
+    REDIS_URL this only clears the calling worker's cache (see init_cache).
+    """
+    try:
+        anyio.from_thread.run(FastAPICache.clear, namespace)
+    except Exception:
+        logger.warning("Could not clear cache namespace %s", namespace, exc_info=True)
+
+
+class RevalidateCachedResponses:
+    """
+    ASGI middleware for cached GET routes whose namespace is cleared on
+    writes. fastapi-cache sends Cache-Control: max-age=<expire>, which lets a
+    browser keep showing a listing for the whole TTL after it was invalidated
+    server-side; no-cache makes it revalidate instead, and the ETag that
+    fastapi-cache also sends turns an unchanged cached entry into a 304.
+    """
+
+    def __init__(self, app, path_prefixes: tuple):
+        self.app = app
+        self.path_prefixes = path_prefixes
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not scope["path"].startswith(self.path_prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_no_cache(message):
+            if message["type"] == "http.response.start":
+                headers = [
+                    (name, value)
+                    for name, value in message.get("headers", [])
+                    if name.lower() != b"cache-control"
+                ]
+                headers.append((b"cache-control", b"no-cache"))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_no_cache)
+
+
+def get_cached_profile(account_uuid: str) -> Optional[bytes]:
+    with _profile_cache_lock:
+        return _profile_cache.get(account_uuid)
+
+
+def cache_profile(account_uuid: str, profile: dict) -> bytes:
+    """Encode and cache a profile payload, returning the JSON body."""
+    body = orjson.dumps(profile)
+    with _profile_cache_lock:
+        _profile_cache[account_uuid] = body
+    return body
+
+
+def invalidate_profile(account_uuid: str):
+    """Drop an account's cached profile after it changes or is deleted."""
+    with _profile_cache_lock:
+        _profile_cache.pop(account_uuid, None)
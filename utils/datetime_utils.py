@@ -17,7 +17,7 @@ def format_datetime(dt):
     if hasattr(dt, 'isoformat'):
         iso_str = dt.isoformat()
         # If the datetime doesn't have timezone info, append Z for UTC
-        if '+' not in iso_str and 'Z' not in iso_str:
+        if getattr(dt, 'tzinfo', None) is None:
             iso_str += 'Z'
         return iso_str
     return dt
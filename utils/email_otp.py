@@ -5,9 +5,12 @@ This module provides functionality for generating, sending, and verifying
 email-based one-time PINs for account registration verification.
 """
 
-import random
+import hmac
+import secrets
 import smtplib
 import os
+import threading
+from functools import lru_cache
 from datetime import datetime, timedelta, timezone
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -34,6 +37,12 @@ class EmailOTP:
     SMTP_PASSWORD = os.environ.get("SMTP_PASSWORD")
     FROM_EMAIL = os.environ.get("FROM_EMAIL", SMTP_USERNAME)
     FROM_NAME = os.environ.get("FROM_NAME", "OpenCircle")
+    SMTP_TIMEOUT_SECONDS = int(os.environ.get("SMTP_TIMEOUT_SECONDS", "30"))
+    
+    # One authenticated SMTP connection reused across emails, so each send
+    # skips the TCP + STARTTLS + AUTH handshake; the lock serialises use of it
+    _smtp: Optional[smtplib.SMTP] = None
+    _smtp_lock = threading.Lock()
     
     @classmethod
     def generate_otp(cls) -> str:
@@ -43,7 +52,7 @@ class EmailOTP:
         Returns:
             str: 6-digit OTP code
         """
-        return ''.join([str(random.randint(0, 9)) for _ in range(cls.OTP_LENGTH)])
+        return ''.join(secrets.choice('0123456789') for _ in range(cls.OTP_LENGTH))
     
     @classmethod
     def get_otp_expiry(cls) -> datetime:
@@ -95,8 +104,10 @@ class EmailOTP:
         if cls.is_otp_expired(expiry_time):
             return False
         
-        # Check if codes match (case-insensitive for safety)
-        return provided_otp.strip().upper() == stored_otp.strip().upper()
+        # Check if codes match (case-insensitive for safety), in constant time
+        return hmac.compare_digest(
+            provided_otp.strip().upper().encode(), stored_otp.strip().upper().encode()
+        )
     
     @classmethod
     def create_email_content(cls, otp_code: str, account_type: str, name: str) -> Tuple[str, str]:
@@ -294,10 +305,7 @@ class EmailOTP:
             msg.attach(part2)
             
             # Send email
-            with smtplib.SMTP(cls.SMTP_SERVER, cls.SMTP_PORT) as server:
-                server.starttls()
-                server.login(cls.SMTP_USERNAME, cls.SMTP_PASSWORD)
-                server.send_message(msg)
+            cls._send_message(msg)
             
             logger.info(f"OTP email sent successfully to {recipient_email}")
             return True
@@ -306,6 +314,49 @@ class EmailOTP:
             logger.error(f"Failed to send OTP email to {recipient_email}: {str(e)}")
             return False
     
+    @classmethod
+    def _connect_smtp(cls) -> smtplib.SMTP:
+        server = smtplib.SMTP(
+            cls.SMTP_SERVER, cls.SMTP_PORT, timeout=cls.SMTP_TIMEOUT_SECONDS
+        )
+        server.starttls()
+        server.login(cls.SMTP_USERNAME, cls.SMTP_PASSWORD)
+        return server
+    
+    @staticmethod
+    def _close_quietly(server: smtplib.SMTP) -> None:
+        try:
+            server.close()
+        except OSError:
+            pass
+    
+    @classmethod
+    def _send_message(cls, msg: MIMEMultipart) -> None:
+        """
+        Send over the shared connection. Any socket or SMTP error drops it
+        and the message is retried once on a fresh connection, which is only
+        kept for later emails if that send succeeds
+        """
+        with EmailOTP._smtp_lock:
+            if EmailOTP._smtp is not None:
+                try:
+                    EmailOTP._smtp.send_message(msg)
+                    return
+                except (OSError, smtplib.SMTPException):
+                    # An idle connection can die as a disconnect, a socket
+                    # timeout or a 421 "service closing"; never keep it
+                    logger.info("SMTP send failed, reconnecting", exc_info=True)
+                    cls._close_quietly(EmailOTP._smtp)
+                    EmailOTP._smtp = None
+            
+            server = cls._connect_smtp()
+            try:
+                server.send_message(msg)
+            except (OSError, smtplib.SMTPException):
+                cls._close_quietly(server)
+                raise
+            EmailOTP._smtp = server
+    
     @classmethod
     def generate_and_send_otp(cls, recipient_email: str, account_type: str, name: str) -> Optional[Tuple[str, datetime]]:
         """
@@ -356,6 +407,7 @@ class MockEmailOTP(EmailOTP):
 
 
 # Use mock email in development if SMTP is not configured
+@lru_cache(maxsize=1)
 def get_email_otp_service() -> EmailOTP:
     """
     Get the appropriate EmailOTP service based on configuration
@@ -6,7 +6,7 @@ import os
 import io
 from typing import Optional, Tuple
 from fastapi import UploadFile
-import uuid
+import secrets
 from pathlib import Path
 
 class FTPManager:
@@ -65,7 +65,7 @@ class FTPManager:
         try:
             # Generate unique filename
             file_extension = Path(file.filename).suffix
-            unique_filename = f"{uuid.uuid4().hex}{file_extension}"
+            unique_filename = f"{secrets.token_hex(16)}{file_extension}"
 
             # Create directory structure: /uploads/uploader_uuid/
             directory = f"{uploader_uuid}"
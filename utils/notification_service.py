@@ -1,7 +1,7 @@
 from enum import Enum
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timezone
-from lib.database import Database
+from lib.database import SessionLocal, get_tables
 from sqlalchemy import insert, update, select
 from sqlalchemy.exc import SQLAlchemyError
 from pydantic import BaseModel
@@ -48,9 +48,8 @@ class NotificationResponse(BaseModel):
 
 class NotificationService:
     def __init__(self):
-        self.db = Database()
-        self.table = self.db.tables
-        self.session = self.db.session
+        self.table = get_tables()
+        self.session = SessionLocal()
 
     def create_notification(
         self,
@@ -0,0 +1,57 @@
+"""Password hashing helpers shared by the signup and sign-in endpoints."""
+
+import os
+import threading
+from functools import lru_cache
+from typing import Optional
+
+import bcrypt
+
+# bcrypt releases the GIL, so hashes run in parallel across the handler
+# threadpool; cap concurrent hashes at the core count so a signup or login
+# burst can't occupy every worker thread with CPU-bound work.
+_HASH_SLOTS = threading.BoundedSemaphore(os.cpu_count() or 1)
+
+# Explicit work factor instead of gensalt()'s library default; each step
+# down halves hashing CPU, so only lower it within the agreed policy
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+
+def hash_password(password: str) -> str:
+    """Return the bcrypt hash of a plaintext password as a string."""
+    with _HASH_SLOTS:
+        salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+        return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+
+def verify_password(password: str, hashed_password: str) -> bool:
+    """Check a plaintext password against a stored bcrypt hash."""
+    with _HASH_SLOTS:
+        return bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
+
+
+@lru_cache(maxsize=1)
+def _dummy_hash() -> str:
+    # Built on first use rather than at import to keep cold starts cheap
+    return hash_password("opencircle-dummy-password")
+
+
+def check_password(password: str, hashed_password: Optional[str]) -> bool:
+    """
+    Verify a sign-in attempt. With no stored hash (unknown login) the password
+    is checked against a dummy hash and False is returned, so the response
+    time doesn't reveal whether the login exists.
+    """
+    if hashed_password is None:
+        verify_password(password, _dummy_hash())
+        return False
+    return verify_password(password, hashed_password)
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """True when a stored hash was made with a different BCRYPT_ROUNDS."""
+    # bcrypt hashes look like $2b$12$<salt+hash>; the cost is the third field
+    try:
+        return int(hashed_password.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
@@ -0,0 +1,39 @@
+"""Per-client request rate limiting built on slowapi."""
+
+import os
+
+from fastapi import Request
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+
+# Sign-in costs a bcrypt check per attempt, so cap attempts per client IP.
+# Counters are per worker unless RATE_LIMIT_STORAGE_URI points at Redis.
+SIGNIN_RATE_LIMIT = os.getenv("SIGNIN_RATE_LIMIT", "10/minute")
+
+# Reverse proxies in front of the app that append to X-Forwarded-For (1 on
+# Vercel and Heroku). With 0 the socket peer is used, which behind a proxy is
+# the proxy itself and would put every client in one shared bucket.
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "0"))
+
+
+def client_ip(request: Request) -> str:
+    """
+    Rate-limit key: the client address recorded by the outermost trusted
+    proxy. Entries further left in X-Forwarded-For are client-supplied, so
+    they are ignored rather than letting a client pick its own bucket.
+    """
+    if TRUSTED_PROXY_HOPS:
+        forwarded = [
+            address.strip()
+            for address in request.headers.get("x-forwarded-for", "").split(",")
+            if address.strip()
+        ]
+        if len(forwarded) >= TRUSTED_PROXY_HOPS:
+            return forwarded[-TRUSTED_PROXY_HOPS]
+    return get_remote_address(request)
+
+
+limiter = Limiter(
+    key_func=client_ip,
+    storage_uri=os.getenv("RATE_LIMIT_STORAGE_URI", "memory://"),
+)
@@ -1,18 +1,20 @@
 import os
+import secrets
 import shutil
-import uuid
 from sqlalchemy import insert, delete
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from lib.database import Database
+from lib.database import SessionLocal, get_tables
 
 # put in a yaml file or secret or OS env variable
 UPLOAD_DIR = "uploads"
 # UPLOAD_DIR = "https://opencircle.pythonanywhere.com/uploads/"
 
+# Uploads are streamed from Starlette's spooled temp file to disk in 1 MiB
+# chunks rather than shutil's 64 KiB default; never read whole into memory
+UPLOAD_CHUNK_SIZE = 1024 * 1024
 
-db = Database()
-table = db.tables
-session = db.session
+
+table = get_tables()
 
 
 def add_resource(file, uploader_uuid):
@@ -27,7 +29,7 @@ def add_resource(file, uploader_uuid):
 
 def _create_filename(uploader_uuid, file):
     original_ext = os.path.splitext(file.filename)[1]
-    unique_id = uuid.uuid4().hex
+    unique_id = secrets.token_hex(16)
     new_filename = f"{uploader_uuid}_{unique_id}{original_ext}"
 
     return new_filename
@@ -37,12 +39,13 @@ def _copy_resource_to_disk(modified_filename, file):
     try:
         file_location = os.path.join(UPLOAD_DIR, modified_filename)
         with open(file_location, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+            shutil.copyfileobj(file.file, buffer, UPLOAD_CHUNK_SIZE)
     except (IOError, OSError) as e:
         raise IOError(f"Error saving resource: {str(e)}")
 
 
 def _save_resource_info_into_database(upload_dir, modified_filename):
+    session = SessionLocal()
     try:
         stmt = insert(table["resource"]).values(
             directory=upload_dir, filename=modified_filename
@@ -64,12 +67,10 @@ def get_resource(resource_id):
     resource = _get_resource_by_id(resource_id)
 
     if not resource:
-        session.close()
         raise FileNotFoundError(detail="Resource not found")
     else:
         file_path = os.path.join(resource.directory, resource.filename)
         if not os.path.exists(file_path):
-            session.close()
             raise FileNotFoundError(detail="Resource file not found")
 
         return {
@@ -79,18 +80,21 @@ def get_resource(resource_id):
 
 
 def _get_resource_by_id(resource_id):
-    return (
-        session.query(table["resource"])
-        .filter(table["resource"].c.id == resource_id)
-        .first()
-    )
+    session = SessionLocal()
+    try:
+        return (
+            session.query(table["resource"])
+            .filter(table["resource"].c.id == resource_id)
+            .first()
+        )
+    finally:
+        session.close()
 
 
 def delete_resource(resource_id, uuid):
     resource = _get_resource_by_id(resource_id)
 
     if not resource:
-        session.close()
         raise FileNotFoundError(status_code=404, detail="Resource not found")
     elif _check_access_to_resource(resource, uuid):
         try:
@@ -112,6 +116,7 @@ def _check_access_to_resource(resource, uuid):
 
 def _delete_resource_from_database(resource_id):
     stmt = delete(table["resource"]).where(table["resource"].c.id == resource_id)
+    session = SessionLocal()
     try:
         result = session.execute(stmt)
         session.commit()
@@ -1,42 +1,60 @@
 import os
 import shutil
-import uuid
 from sqlalchemy import insert, delete, update
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from lib.database import Database
+from lib.database import SessionLocal, get_tables
 from pydantic import BaseModel, constr
 from typing import Optional
 from utils.resource_utils import add_resource, delete_resource, get_resource
 from fastapi import APIRouter, UploadFile, File, HTTPException, Path, Query
 from lib.models import SessionModel
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, Cookie, HTTPException, Request
 from pydantic import BaseModel, constr
-from lib.database import Database
 from sqlalchemy import insert, delete, select
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime, timedelta, timezone
-import jwt
+import hashlib
+import secrets
+import threading
+from cachetools import TTLCache
 
-db = Database()
-table = db.tables
-session = db.session
+table = get_tables()
 
-SECRET_KEY = os.environ.get("JWT_SECRET_KEY", "fallback-unsafe-key")
 SESSION_DURATION_MINUTES = 60  # 1 hour session
 
+# Verified token -> (account_uuid, expires_at), keyed by sha256 of the token so
+# raw tokens are not held in memory. Each worker has its own cache, so the TTL
+# bounds how long a session revoked through another worker stays usable.
+SESSION_CACHE_TTL_SECONDS = int(os.getenv("SESSION_CACHE_TTL_SECONDS", "60"))
+_session_cache = TTLCache(maxsize=10000, ttl=SESSION_CACHE_TTL_SECONDS)
+_session_cache_lock = threading.Lock()
+
+
+def _token_key(session_token: str) -> bytes:
+    return hashlib.sha256(session_token.encode("utf-8")).digest()
+
+
+def invalidate_account_sessions(account_uuid: str):
+    """Drop every cached session for an account, e.g. after it is deleted."""
+    with _session_cache_lock:
+        stale = [
+            key
+            for key, (cached_uuid, _) in _session_cache.items()
+            if cached_uuid == account_uuid
+        ]
+        for key in stale:
+            _session_cache.pop(key, None)
+
 
 def add_session(account_uuid: str, request: Request):
+    session = SessionLocal()
     now = datetime.now(tz=timezone.utc)
     expires_at_date_time = now + timedelta(minutes=SESSION_DURATION_MINUTES)
     ip_address = request.client.host
     user_agent = request.headers.get("user-agent", "")
-    payload = {
-        "account_uuid": account_uuid,
-        "exp": expires_at_date_time,
-        "iat": now,
-    }
-
-    session_token = jwt.encode(payload, SECRET_KEY, algorithm="HS256")
+    # Opaque random token; the session table row is what makes it valid, so
+    # there is nothing to sign or decode
+    session_token = secrets.token_urlsafe(32)
 
     stmt = insert(table["session"]).values(
         account_uuid=account_uuid,
@@ -62,6 +80,9 @@ def add_session(account_uuid: str, request: Request):
 
 
 def delete_session(session_token: str):
+    with _session_cache_lock:
+        _session_cache.pop(_token_key(session_token), None)
+    session = SessionLocal()
     try:
         stmt = delete(table["session"]).where(
             table["session"].c.session_token == session_token
@@ -77,6 +98,7 @@ def delete_session(session_token: str):
 
 
 def update_session_last_activity(session_token: str):
+    session = SessionLocal()
     try:
         stmt = (
             update(table["session"])
@@ -98,17 +120,41 @@ def get_account_uuid_from_session(session_token: str) -> str:
     Returns the account_uuid associated with the given session_token.
     Raises HTTPException if session is missing or invalid.
     """
+    now = datetime.now(tz=timezone.utc)
+    key = _token_key(session_token)
+    with _session_cache_lock:
+        cached = _session_cache.get(key)
+    if cached and cached[1] > now:
+        return cached[0]
+
+    session = SessionLocal()
     try:
-        now = datetime.now(tz=timezone.utc)
-        stmt = select(table["session"].c.account_uuid).where(
+        stmt = select(
+            table["session"].c.account_uuid, table["session"].c.expires_at
+        ).where(
             table["session"].c.session_token == session_token,
             table["session"].c.expires_at > now,
         )
         session_row = session.execute(stmt).first()
         if not session_row:
             raise HTTPException(status_code=401, detail="Invalid or expired session")
-        return session_row._mapping["account_uuid"]
+        account_uuid, expires_at = session_row
+        # MySQL DATETIME comes back naive; the column is written in UTC
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        with _session_cache_lock:
+            _session_cache[key] = (account_uuid, expires_at)
+        return account_uuid
     except SQLAlchemyError as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
         session.close()
+
+
+def current_account_uuid(session_token: str = Cookie(...)) -> str:
+    """
+    FastAPI dependency resolving the session cookie to its account_uuid.
+    Declare it before Depends(get_db) so an invalid session is rejected with
+    401 before the handler's database session is created.
+    """
+    return get_account_uuid_from_session(session_token)
@@ -5,6 +5,7 @@ import pyotp
 import qrcode
 import io
 import base64
+import hmac
 import json
 import secrets
 from typing import List, Optional, Tuple
@@ -70,17 +71,24 @@ class TwoFactorAuth:
         """
         try:
             backup_codes = json.loads(backup_codes_json)
-            provided_code = provided_code.upper().strip()
+            provided = provided_code.upper().strip().encode()
             
-            if provided_code in backup_codes:
+            # Compare against every code in constant time so the response
+            # time doesn't reveal whether, or where, a code matched
+            match_index = -1
+            for index, code in enumerate(backup_codes):
+                if hmac.compare_digest(code.encode(), provided):
+                    match_index = index
+            
+            if match_index >= 0:
                 # Remove the used code
-                backup_codes.remove(provided_code)
+                backup_codes.pop(match_index)
                 updated_json = json.dumps(backup_codes)
                 return True, updated_json
             else:
                 return False, backup_codes_json
                 
-        except (json.JSONDecodeError, TypeError):
+        except (json.JSONDecodeError, TypeError, AttributeError):
             return False, backup_codes_json
     
     @staticmethod